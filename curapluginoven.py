@@ -0,0 +1,3132 @@
+# Copyright (c) 2019 Thomas Karl Pietrowski
+
+import atexit
+
+# File and OS handling
+import io
+import os
+import sys
+import time
+from stat import ST_MODE
+
+# Everything else is imported where it is needed, as most of it is slow to import and no run needs all of it.
+# ast, compileall, concurrent.futures, http.client, tarfile, urllib.request and cryptography (optional,
+# for signing manifests with Ed25519) are only used by optional stages.
+
+# Advisory file locking
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+cpo_version = "0.0.1"
+
+# File extensions
+system_files = [".",
+                "Thumbs.db"]
+
+python_sources = [".py"]
+python_bytecompiled = [".pyc",
+                       ".pyo",
+                       ]
+qml_bytecompiled = [".qmlc",
+                    ]
+python_files = python_sources + python_bytecompiled
+
+excluded_extentions = [".chm", # Windows Compressed HTML Help
+                       ] + python_bytecompiled + qml_bytecompiled
+
+essential_package_fields = (("package_id",),
+                            ("package_type",),
+                            ("display_name",),
+                            ("description",),
+                            ("package_version",),
+                            ("sdk_version",),
+                            ("website",),
+                            ("author",),
+                            ("author", "author_id"),
+                            ("author", "display_name"),
+                            ("author", "email"),
+                            ("author", "website"),
+                            ("tags",),
+                            )
+package_600_fields = essential_package_fields + (("sdk_version_semver",),
+                                                 )
+
+essential_plugin_fields = ("name",
+                           "id",
+                           "i18n-catalog",
+                           "author",
+                           "email",
+                           "version",
+                           "description",
+                           )
+
+package_metadata_filename = "package.json"
+plugin_metadata_filename = "plugin.json"
+metadata_filenames = (package_metadata_filename,
+                      plugin_metadata_filename)
+
+# Entries, which are placed first when using the metadata-first archive layout
+archive_layouts = ("default",
+                   "metadata-first",
+                   )
+archive_metadata_filenames = ("[Content_Types].xml",
+                              ) + metadata_filenames
+archive_index_extension = ".index.json"
+archive_manifest_extension = ".manifest.json"
+archive_signature_extension = ".sig"
+archive_size_report_extension = ".size-report.json"
+archive_sidecar_extensions = (archive_index_extension,
+                              archive_size_report_extension,
+                              archive_manifest_extension,
+                              archive_manifest_extension + archive_signature_extension,
+                              )
+archive_fingerprint_extension = ".fingerprint.json"
+import_report_extension = ".import-report.json"
+delta_extension = ".delta"
+delta_metadata_filename = "delta.json"
+delta_segments_filename = "segments.bin"
+delta_minimum_reuse = 64 # bytes, smaller data is cheaper to store than to reference
+delta_base_version_pattern = r"\d+(\.\d+)*([-+~][0-9A-Za-z.]+)?" # Like 1.0.0, 1.0.0-beta.1 or 1.0.0+build5
+entry_cache_minimum_size = 4096 # bytes, smaller entries are compressed faster than looked up
+signature_methods = ("hmac-sha256",
+                     "ed25519",
+                     )
+
+# Compression methods as numbered by the zip format, the same as zipfile.ZIP_*
+zip_stored = 0
+zip_deflated = 8
+zip_bzip2 = 12
+zip_lzma = 14
+compression_methods = {"none": zip_stored,
+                       "zlib": zip_deflated,
+                       "bzip2": zip_bzip2,
+                       "lzma": zip_lzma,
+                       }
+# zipfile ignores the level for stored and LZMA compressed entries
+compression_presets = {"fast": {zip_deflated: 1,
+                                zip_bzip2: 1,
+                                },
+                       "balanced": {zip_deflated: 6,
+                                    zip_bzip2: 5,
+                                    },
+                       "smallest": {zip_deflated: 9,
+                                    zip_bzip2: 9,
+                                    },
+                       }
+# Candidates for --compression=auto as (method, level)
+compression_candidates = ((zip_stored, None),
+                          (zip_deflated, 1),
+                          (zip_deflated, 6),
+                          (zip_deflated, 9),
+                          (zip_bzip2, 1),
+                          (zip_bzip2, 9),
+                          (zip_lzma, None),
+                          )
+compression_sample_size = 4 * 1024 * 1024
+compression_sample_files = 64 # Files the sample is taken from, each one contributes an equal share
+
+# Directories, which usually contain vendored packages (all in lowercase)
+vendored_directories = ("lib",
+                        "libs",
+                        "vendor",
+                        "vendored",
+                        "third_party",
+                        "thirdparty",
+                        "site-packages",
+                        )
+zipimport_modes = ("none",
+                   "stored",
+                   "pyc",
+                   )
+zipimport_bootstrap_module = "_cpo_zipimport"
+
+# Modules provided by Cura at runtime
+host_modules = ("UM",
+                "cura",
+                )
+
+# Source archives, which can be built from without extracting them into a directory
+source_archive_extensions = (".zip",
+                             ".tar",
+                             ".tar.gz",
+                             ".tgz",
+                             ".tar.bz2",
+                             ".tbz2",
+                             ".tar.xz",
+                             ".txz",
+                             )
+
+license_filenames = ("LICENSE",
+                     "LICENSE.txt",)
+# all in lowercase
+test_directories = ("test",
+                    "tests",
+                    )
+
+# Temporary files of this run, which are still there at exit, if the run was aborted
+temporary_files = []
+
+def isUrlAddress(address):
+    from urllib.parse import urlparse
+    try:
+        urlparse(address)
+        return True
+    except:
+        return False
+
+def isProcessRunning(pid):
+    "Tests, whether a process with this pid is running on this host"
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows
+        import ctypes
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error = True)
+        handle = kernel32.OpenProcess(0x1000, False, pid) # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return ctypes.get_last_error() == 5 # ERROR_ACCESS_DENIED, running as another user
+        try:
+            exit_code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+            return exit_code.value == 259 # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass # Running as another user
+    return True
+
+def isLeftOver(pid):
+    "Tests, whether something named after pid was left behind by a run, which was killed"
+    try:
+        pid = int(pid)
+    except ValueError:
+        return False
+    return pid != os.getpid() and not isProcessRunning(pid)
+
+def removeWorkDirectory(location, base):
+    import shutil
+    shutil.rmtree(location, ignore_errors = True)
+    # Removing the base only when no other run is using it anymore
+    with AdvisoryLock(base):
+        try:
+            os.rmdir(base)
+        except OSError:
+            pass
+
+def createWorkDirectory(base):
+    "Creates an unique directory for this run below base, which is removed on exit"
+    import shutil
+    import tempfile
+    with AdvisoryLock(base):
+        os.makedirs(base, exist_ok = True)
+        # Directories of killed runs, which never got to remove them
+        for filename in os.listdir(base):
+            if filename.startswith("run-") and isLeftOver(filename.split("-")[1]):
+                print("d Removing directory of a killed run: {}".format(filename))
+                shutil.rmtree(os.path.join(base, filename), ignore_errors = True)
+        location = tempfile.mkdtemp(prefix = "run-{}-".format(os.getpid()),
+                                    dir = base)
+    atexit.register(removeWorkDirectory, location, base)
+    return location
+
+class AdvisoryLock():
+    "Serializes access to location between several runs on the same host"
+
+    def __init__(self, location):
+        self.location = location
+        self.lock_handle = None
+
+    def __enter__(self):
+        import hashlib
+        import tempfile
+        lock_dir = os.path.join(tempfile.gettempdir(), "cpo-locks")
+        os.makedirs(lock_dir, exist_ok = True)
+        lock_name = hashlib.sha1(os.path.realpath(self.location).encode("utf-8")).hexdigest()
+        self.lock_handle = open(os.path.join(lock_dir, lock_name + ".lock"), "a+")
+        if fcntl:
+            fcntl.flock(self.lock_handle.fileno(), fcntl.LOCK_EX)
+        elif msvcrt:
+            self.lock_handle.seek(0)
+            msvcrt.locking(self.lock_handle.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        if fcntl:
+            fcntl.flock(self.lock_handle.fileno(), fcntl.LOCK_UN)
+        elif msvcrt:
+            self.lock_handle.seek(0)
+            msvcrt.locking(self.lock_handle.fileno(), msvcrt.LK_UNLCK, 1)
+        self.lock_handle.close()
+
+def createTemporaryFile(destination, remove_left_overs = True):
+    "Creates a temporary file next to destination, which can be renamed atomically onto it"
+    import tempfile
+    directory = os.path.dirname(destination) or os.curdir
+    prefix = ".{}.".format(os.path.basename(destination))
+    if remove_left_overs:
+        for filename in os.listdir(directory):
+            if filename.startswith(prefix) and filename.endswith(".tmp") and isLeftOver(filename[len(prefix):].split(".")[0]):
+                removeFile(os.path.join(directory, filename))
+    if not temporary_files:
+        atexit.register(removeTemporaryFiles)
+    handle, location = tempfile.mkstemp(prefix = "{}{}.".format(prefix, os.getpid()),
+                                        suffix = ".tmp",
+                                        dir = directory)
+    os.close(handle)
+    temporary_files.append(location)
+    # mkstemp creates private files, but the published file shall get the usual permissions
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(location, 0o666 & ~umask)
+    return location
+
+def removeFile(location):
+    try:
+        os.remove(location)
+    except OSError:
+        pass
+
+def removeTemporaryFiles():
+    # Already renamed onto their destinations, unless the run was aborted
+    for location in temporary_files:
+        removeFile(location)
+
+def exitOnSignal(signal_number, frame):
+    "Exits like on errors, so atexit handlers and finally blocks remove the files of this run"
+    print("e Terminated by signal {}!".format(signal_number))
+    sys.exit(128 + signal_number)
+
+class HashingWriter():
+    "Hashes everything written to a file handle. Not seekable, so zipfile streams the entries in a single pass."
+
+    def __init__(self, handle):
+        import hashlib
+        self.handle = handle
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.hash.update(data)
+        self.size += len(data)
+        return self.handle.write(data)
+
+    def tell(self):
+        return self.size
+
+    def flush(self):
+        self.handle.flush()
+
+    def hexdigest(self):
+        return self.hash.hexdigest()
+
+def signManifest(data, key_file, method):
+    import hashlib
+    import hmac
+    with open(key_file, "rb") as key_handle:
+        key = key_handle.read()
+
+    if method == "hmac-sha256":
+        return hmac.new(key, data, hashlib.sha256).hexdigest()
+    elif method == "ed25519":
+        try:
+            from cryptography.hazmat.primitives import serialization
+            from cryptography.hazmat.primitives.asymmetric import ed25519
+        except ImportError:
+            raise ValueError("Signing with Ed25519 requires the cryptography package!")
+        if len(key) == 32: # raw private key
+            private_key = ed25519.Ed25519PrivateKey.from_private_bytes(key)
+        else:
+            private_key = serialization.load_pem_private_key(key, password = None)
+        return private_key.sign(data).hex()
+    raise ValueError("Unknown signature method: {}".format(repr(method)))
+
+def getCompressionName(method):
+    for name, compression_method in compression_methods.items():
+        if compression_method == method:
+            return name
+
+def httpHeader(value):
+    import argparse
+    name, separator, content = value.partition(":")
+    if not separator or not name.strip():
+        raise argparse.ArgumentTypeError("Expected a header like \"Name: value\"")
+    return (name.strip(), content.strip())
+
+def compressionLevel(value):
+    import argparse
+    if value in compression_presets.keys():
+        return value
+    try:
+        level = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("Expected a level between 0 and 9 or one of: {}".format(", ".join(compression_presets.keys())))
+    if level not in range(10):
+        raise argparse.ArgumentTypeError("Expected a level between 0 and 9")
+    return level
+
+def compressSample(data, method, level):
+    # Same raw streams as written by zipfile
+    import bz2
+    import lzma
+    import zipfile
+    import zlib
+    if method == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        return compressor.compress(data) + compressor.flush()
+    elif method == zipfile.ZIP_BZIP2:
+        return bz2.compress(data, level)
+    elif method == zipfile.ZIP_LZMA:
+        return lzma.compress(data, format = lzma.FORMAT_RAW, filters = [{"id": lzma.FILTER_LZMA1}])
+    return data
+
+# zipfile has no public API to write compressed data as it is. writeZipEntry uses its internals,
+# which are checked for these Python versions. Others compress every entry again.
+raw_entry_python_versions = ((3, 7), (3, 13))
+raw_entries_supported = raw_entry_python_versions[0] <= sys.version_info[:2] <= raw_entry_python_versions[1]
+
+def writeZipEntry(zip_object, zipinfo, data, compresslevel, raw_entry = None, keep_raw_entry = False):
+    """Writes data into the archive. raw_entry = (crc, flag_bits, raw_data) is the same data compressed before, which is copied as it is.
+    Returns the raw entry as written, when asked to keep it, or None when zipfile compressed the data itself."""
+    import zipfile
+    import zlib
+    if not raw_entries_supported or (raw_entry is None and not keep_raw_entry):
+        zip_object.writestr(zipinfo, data, compresslevel = compresslevel)
+        return None
+    if raw_entry is None:
+        compressor = zipfile._get_compressor(zipinfo.compress_type, compresslevel)
+        flag_bits = 0x02 if zipinfo.compress_type == zipfile.ZIP_LZMA else 0 # LZMA streams have an end of stream marker
+        raw_entry = (zlib.crc32(data), flag_bits, compressor.compress(data) + compressor.flush() if compressor else data)
+    crc, flag_bits, raw_data = raw_entry
+    if crc != zlib.crc32(data):
+        # Compressed from other data, never copying it
+        zip_object.writestr(zipinfo, data, compresslevel = compresslevel)
+        return None
+
+    # Appending the entry the way zipfile does it
+    zipinfo.flag_bits = flag_bits & ~0x08 # Sizes are known, no data descriptor needed
+    zipinfo.CRC = crc
+    zipinfo.file_size = len(data)
+    zipinfo.compress_size = len(raw_data)
+    zipinfo.header_offset = zip_object.fp.tell()
+    zip_object.fp.write(zipinfo.FileHeader())
+    zip_object.fp.write(raw_data)
+    zip_object.start_dir = zip_object.fp.tell()
+    zip_object.filelist.append(zipinfo)
+    zip_object.NameToInfo[zipinfo.filename] = zipinfo
+    return raw_entry
+
+class EntryCache():
+    """Content addressed store of compressed zip entries, shared between plugins and runs.
+    Each file holds the CRC, flag bits and sizes of the entry and the SHA-256 of its raw compressed stream, followed by the stream."""
+
+    header_format = "<IHQQ32s"
+
+    def __init__(self, location, max_size):
+        self.location = os.path.realpath(location)
+        self.max_size = max_size
+        self.lookups = 0
+        self.hits = 0
+        os.makedirs(self.location, exist_ok = True)
+
+    def getPath(self, sha256, method, level):
+        return os.path.join(self.location, sha256[:2], "{}-{}-{}".format(sha256, method, level))
+
+    def get(self, sha256, method, level):
+        "Returns (crc, flag_bits, file_size, raw_data) or None"
+        import hashlib
+        import struct
+        self.lookups += 1
+        location = self.getPath(sha256, method, level)
+        try:
+            with open(location, "rb") as entry_handle:
+                header = entry_handle.read(struct.calcsize(self.header_format))
+                raw_data = entry_handle.read()
+        except OSError:
+            return None
+        try:
+            crc, flag_bits, file_size, compress_size, raw_sha256 = struct.unpack(self.header_format, header)
+        except struct.error:
+            compress_size = raw_sha256 = None
+        if len(raw_data) != compress_size or hashlib.sha256(raw_data).digest() != raw_sha256:
+            # Truncated or damaged. Removed, so it gets written again.
+            print("w Damaged entry removed from the entry cache: {}".format(location))
+            removeFile(location)
+            return None
+        try:
+            os.utime(location) # Recently used entries are evicted last
+        except OSError:
+            pass
+        self.hits += 1
+        return crc, flag_bits, file_size, raw_data
+
+    def put(self, sha256, method, level, crc, flag_bits, file_size, raw_data):
+        import hashlib
+        import struct
+        location = self.getPath(sha256, method, level)
+        if os.path.isfile(location):
+            return
+        os.makedirs(os.path.dirname(location), exist_ok = True)
+        # Many entries are written, left overs are removed by trim()
+        temporary_file = createTemporaryFile(location, remove_left_overs = False)
+        with open(temporary_file, "wb") as entry_handle:
+            entry_handle.write(struct.pack(self.header_format, crc, flag_bits, file_size, len(raw_data), hashlib.sha256(raw_data).digest()))
+            entry_handle.write(raw_data)
+        os.replace(temporary_file, location)
+
+    def trim(self):
+        "Evicts the least recently used entries, until the cache fits into its maximum size"
+        removed = 0
+        with AdvisoryLock(self.location):
+            entries = []
+            for root, dirs, filenames in os.walk(self.location):
+                for filename in filenames:
+                    location = os.path.join(root, filename)
+                    if filename.startswith("."):
+                        # Being written by another run, or left over by a killed one
+                        if filename.endswith(".tmp") and filename.count(".") >= 3 and isLeftOver(filename.split(".")[-3]):
+                            removeFile(location)
+                        continue
+                    try:
+                        entry_stat = os.stat(location)
+                    except OSError:
+                        continue
+                    entries.append((entry_stat.st_mtime, entry_stat.st_size, location))
+            size = sum([entry_size for mtime, entry_size, location in entries])
+            for mtime, entry_size, location in sorted(entries):
+                if size <= self.max_size:
+                    break
+                try:
+                    os.remove(location)
+                except OSError:
+                    continue
+                size -= entry_size
+                removed += 1
+        if self.lookups:
+            print("i Entry cache: {} of {} entries reused ({:.1%})".format(self.hits, self.lookups, self.hits / self.lookups))
+        if removed:
+            print("i Entry cache: Evicted {} entries, {} bytes left".format(removed, size))
+
+class Publisher():
+    """Uploads artifacts concurrently over a pool of persistent HTTP connections.
+
+    Protocol of the artifact store:
+    * HEAD <url>/<name> with X-Checksum-Sha256 answers 200 and the same checksum for a complete artifact,
+      308 with "Range: bytes=0-<last>" for a partial upload of it or 404 otherwise.
+    * PUT <url>/<name> uploads a chunk given by Content-Range. It answers 308 until the upload is complete.
+    """
+
+    def __init__(self, url, jobs = 4, chunk_size = 8 * 1024 * 1024, retries = 3, headers = None):
+        import queue
+        from urllib.parse import urlparse
+        self.url = urlparse(url)
+        self.jobs = jobs
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.headers = headers or {}
+        self.artifacts = []
+        self.connections = queue.Queue()
+
+    def add(self, location):
+        if location not in self.artifacts:
+            self.artifacts.append(location)
+
+    def getConnection(self):
+        import http.client
+        import queue
+        try:
+            return self.connections.get_nowait()
+        except queue.Empty:
+            pass
+        if self.url.scheme == "https":
+            return http.client.HTTPSConnection(self.url.netloc, timeout = 60)
+        return http.client.HTTPConnection(self.url.netloc, timeout = 60)
+
+    def request(self, connection, method, path, body = None, headers = None):
+        request_headers = dict(self.headers)
+        request_headers.update(headers or {})
+        connection.request(method, path, body = body, headers = request_headers)
+        response = connection.getresponse()
+        response.read() # Needed to reuse the connection
+        return response
+
+    def getUploadOffset(self, connection, path, digest, size):
+        response = self.request(connection, "HEAD", path, headers = {"X-Checksum-Sha256": digest})
+        if response.status == 200 and response.getheader("X-Checksum-Sha256") == digest:
+            return None # Already on the server
+        if response.status == 308 and response.getheader("Range", "").startswith("bytes=0-"):
+            return min(int(response.getheader("Range")[len("bytes=0-"):]) + 1, size)
+        return 0
+
+    def upload(self, location):
+        import hashlib
+        import http.client
+        from urllib.parse import quote
+        digest = hashlib.sha256()
+        with open(location, "rb") as artifact_handle:
+            for chunk in iter(lambda: artifact_handle.read(1 << 16), b""):
+                digest.update(chunk)
+        digest = digest.hexdigest()
+        size = os.path.getsize(location)
+        path = self.url.path.rstrip("/") + "/" + quote(os.path.basename(location))
+
+        error = None
+        for attempt in range(self.retries + 1):
+            connection = self.getConnection()
+            try:
+                offset = self.getUploadOffset(connection, path, digest, size)
+                if offset is None:
+                    self.connections.put(connection)
+                    return (location, "skipped, already on the server", None)
+                resumed_at = offset
+                with open(location, "rb") as artifact_handle:
+                    artifact_handle.seek(offset)
+                    while True:
+                        chunk = artifact_handle.read(self.chunk_size)
+                        headers = {"X-Checksum-Sha256": digest,
+                                   "Content-Type": "application/octet-stream",
+                                   }
+                        if offset < size:
+                            headers["Content-Range"] = "bytes {}-{}/{}".format(offset, offset + len(chunk) - 1, size)
+                        elif size:
+                            # The server has all bytes already, only completing the upload
+                            headers["Content-Range"] = "bytes */{}".format(size)
+                        response = self.request(connection, "PUT", path, body = chunk, headers = headers)
+                        if response.status not in (200, 201, 204, 308):
+                            raise http.client.HTTPException("HTTP {} {}".format(response.status, response.reason))
+                        offset += len(chunk)
+                        if offset >= size:
+                            break
+                self.connections.put(connection)
+                if resumed_at:
+                    return (location, "uploaded, resumed at {} bytes".format(resumed_at), None)
+                return (location, "uploaded", None)
+            except (OSError, http.client.HTTPException) as exception:
+                # Connection is in an unknown state, resuming with a fresh one
+                connection.close()
+                error = exception
+                print("w Upload of {} failed (attempt {}): {}".format(os.path.basename(location), attempt + 1, error))
+        return (location, None, error)
+
+    def run(self):
+        from concurrent.futures import ThreadPoolExecutor
+        if not self.artifacts:
+            return True
+        with ThreadPoolExecutor(max_workers = self.jobs) as executor:
+            results = list(executor.map(self.upload, self.artifacts))
+        while not self.connections.empty():
+            self.connections.get_nowait().close()
+
+        success = True
+        for location, status, error in results:
+            if error:
+                print("e Publishing failed: {} ({})".format(location, error))
+                success = False
+            else:
+                print("i Published: {} ({})".format(location, status))
+        return success
+
+def getDataOffset(archive_handle, zipinfo):
+    # Local file headers may carry different extra fields than the central directory
+    import struct
+    import zipfile
+    archive_handle.seek(zipinfo.header_offset)
+    name_length, extra_length = struct.unpack("<HH", archive_handle.read(zipfile.sizeFileHeader)[26:30])
+    return zipinfo.header_offset + zipfile.sizeFileHeader + name_length + extra_length
+
+def getArchiveSegments(archive_file):
+    "Splits an archive into (kind, offset, length, zipinfo) segments, where kind is either header or data"
+    import zipfile
+    segments = []
+    with open(archive_file, "rb") as archive_handle, zipfile.ZipFile(archive_handle, "r") as zip_ref:
+        position = 0
+        for zipinfo in sorted(zip_ref.infolist(), key = lambda zipinfo: zipinfo.header_offset):
+            data_offset = getDataOffset(archive_handle, zipinfo)
+            # Everything in front of the data: local header and whatever precedes it (e.g. data descriptors)
+            segments.append(("header", position, data_offset - position, zipinfo))
+            segments.append(("data", data_offset, zipinfo.compress_size, zipinfo))
+            position = data_offset + zipinfo.compress_size
+        # Central directory and end record
+        segments.append(("header", position, os.path.getsize(archive_file) - position, None))
+    return segments
+
+def getEntryKey(zipinfo):
+    # Equal compressed data is expected for equal content, compression and compressed size
+    return (zipinfo.CRC, zipinfo.file_size, zipinfo.compress_type, zipinfo.compress_size)
+
+def hashFile(location):
+    import hashlib
+    digest = hashlib.sha256()
+    with open(location, "rb") as file_handle:
+        for chunk in iter(lambda: file_handle.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def getOvenHash():
+    "Hashes the code of the oven itself, as cpo_version isn't bumped for every change of the output"
+    import hashlib
+    try:
+        # Reads the source, or the bytecode out of the library archive of frozen builds
+        return hashlib.sha256(__loader__.get_data(__file__)).hexdigest()
+    except (AttributeError, OSError):
+        return hashFile(sys.executable)
+
+def isDeltaUpToDate(base_file, target_file, delta_file):
+    "Tests, whether delta_file updates base_file to target_file, as they are now"
+    import json
+    import zipfile
+    try:
+        with zipfile.ZipFile(delta_file, "r") as delta_zip:
+            delta = json.loads(delta_zip.read(delta_metadata_filename).decode("utf-8"))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return False
+    for role, location in (("base", base_file), ("target", target_file)):
+        if delta[role]["name"] != os.path.basename(location) or delta[role]["size"] != os.path.getsize(location):
+            return False
+        if delta[role]["sha256"] != hashFile(location):
+            return False
+    return True
+
+def createDelta(base_file, target_file, delta_file):
+    # Only the central directories and local headers are read to compare both archives
+    import json
+    import zipfile
+    base_data = {}
+    base_names = []
+    for kind, offset, length, zipinfo in getArchiveSegments(base_file):
+        if kind == "data":
+            base_data.setdefault(getEntryKey(zipinfo), offset)
+            base_names.append(zipinfo.filename)
+
+    delta = {"base": {"name": os.path.basename(base_file),
+                      "size": os.path.getsize(base_file),
+                      "sha256": hashFile(base_file),
+                      },
+             "target": {"name": os.path.basename(target_file),
+                        "size": os.path.getsize(target_file),
+                        "sha256": hashFile(target_file),
+                        },
+             "added": [],
+             "changed": [],
+             "removed": [],
+             "segments": [],
+             }
+    target_names = []
+    temporary_file = createTemporaryFile(delta_file)
+    with open(target_file, "rb") as target_handle, zipfile.ZipFile(temporary_file, "w", compression = zipfile.ZIP_DEFLATED) as delta_zip:
+        with delta_zip.open(delta_segments_filename, "w") as segments_handle:
+            for kind, offset, length, zipinfo in getArchiveSegments(target_file):
+                if zipinfo and kind == "data":
+                    target_names.append(zipinfo.filename)
+                if kind == "data" and getEntryKey(zipinfo) in base_data and length >= delta_minimum_reuse:
+                    delta["segments"].append(["base", base_data[getEntryKey(zipinfo)], length])
+                    continue
+                if kind == "data" and getEntryKey(zipinfo) not in base_data:
+                    delta["changed" if zipinfo.filename in base_names else "added"].append(zipinfo.filename)
+                target_handle.seek(offset)
+                segments_handle.write(target_handle.read(length))
+                if delta["segments"] and delta["segments"][-1][0] == "delta":
+                    delta["segments"][-1][1] += length
+                else:
+                    delta["segments"].append(["delta", length])
+        delta["removed"] = sorted(set(base_names) - set(target_names))
+
+        # The new metadata stays readable without reconstructing the package
+        with zipfile.ZipFile(target_file, "r") as target_zip:
+            for name in target_zip.namelist():
+                if name.split("/")[-1] in metadata_filenames:
+                    delta_zip.writestr("metadata/" + name, target_zip.read(name))
+        delta_zip.writestr(delta_metadata_filename, json.dumps(delta, indent = 4))
+    os.replace(temporary_file, delta_file)
+
+    print("i Delta written: {} ({} added, {} changed, {} removed, {} of {} bytes)".format(delta_file,
+                                                                                          len(delta["added"]),
+                                                                                          len(delta["changed"]),
+                                                                                          len(delta["removed"]),
+                                                                                          os.path.getsize(delta_file),
+                                                                                          delta["target"]["size"]))
+    return delta_file
+
+def applyDelta(delta_file, base_file, destination):
+    import json
+    import zipfile
+    with zipfile.ZipFile(delta_file, "r") as delta_zip:
+        delta = json.loads(delta_zip.read(delta_metadata_filename).decode("utf-8"))
+        if hashFile(base_file) != delta["base"]["sha256"]:
+            print("e The delta was not created for this base: {}".format(base_file))
+            return None
+        if os.path.isdir(destination):
+            destination = os.path.join(destination, delta["target"]["name"])
+
+        temporary_file = createTemporaryFile(destination)
+        try:
+            with open(base_file, "rb") as base_handle, delta_zip.open(delta_segments_filename, "r") as segments_handle, open(temporary_file, "wb") as target_handle:
+                for segment in delta["segments"]:
+                    if segment[0] == "base":
+                        base_handle.seek(segment[1])
+                        target_handle.write(base_handle.read(segment[2]))
+                    else:
+                        target_handle.write(segments_handle.read(segment[1]))
+            if hashFile(temporary_file) != delta["target"]["sha256"]:
+                print("e Reconstructed package does not match the expected checksum!")
+                return None
+            os.replace(temporary_file, destination)
+        finally:
+            if os.path.isfile(temporary_file):
+                os.remove(temporary_file)
+
+    print("i Package reconstructed: {}".format(destination))
+    return destination
+
+def isSourceArchive(location):
+    return location.lower().endswith(source_archive_extensions)
+
+class DirectorySource():
+    "Gives access to the files of a source directory"
+
+    def __init__(self, location = None):
+        self.location = location
+        self.object_ids = None
+
+    def getObjectId(self, path):
+        "Returns the git blob hash of a tracked and unmodified file, or None when the file needs to be hashed"
+        if self.object_ids is None:
+            self.object_ids = getGitObjectIds(self.location) if self.location else {}
+        return self.object_ids.get(os.path.realpath(path))
+
+    def isdir(self, path):
+        return os.path.isdir(path)
+
+    def isfile(self, path):
+        return os.path.isfile(path)
+
+    def walk(self, top):
+        return os.walk(top)
+
+    def open(self, path):
+        return open(path, "rb")
+
+    def copyfile(self, source, destination):
+        import shutil
+        shutil.copyfile(source, destination)
+
+class ArchiveSource(DirectorySource):
+    """Gives access to the files inside a source archive without extracting it into a directory.
+    Zip files are read in place. Tar files are decompressed once into a temporary file, which holds all their files."""
+
+    def __init__(self, location):
+        import shutil
+        import tempfile
+        import zipfile
+        self.location = os.path.realpath(location)
+
+        if zipfile.is_zipfile(self.location):
+            self.archive = zipfile.ZipFile(self.location, "r")
+            members = [(member.filename, member) for member in self.archive.infolist() if not member.is_dir()]
+        else:
+            import tarfile
+            # Compressed tar files can't seek, every jump backwards decompresses from the start again.
+            # The sources are read several times and not in archive order, so all files are
+            # spooled uncompressed into a temporary file in a single pass.
+            self.archive = tempfile.TemporaryFile()
+            members = []
+            with tarfile.open(self.location, "r|*") as tar_archive:
+                for member in tar_archive:
+                    if not member.isfile():
+                        continue
+                    offset = self.archive.tell()
+                    shutil.copyfileobj(tar_archive.extractfile(member), self.archive)
+                    members.append((member.name, (offset, member.size)))
+        atexit.register(self.archive.close)
+        self.object_ids = {}
+
+        names = [name[2:] if name.startswith("./") else name for name, member in members]
+
+        # Release archives usually place everything inside a single top-level directory
+        prefix = ""
+        top_levels = set([name.split("/", 1)[0] for name in names])
+        if len(top_levels) == 1 and all(["/" in name for name in names]):
+            prefix = top_levels.pop() + "/"
+
+        self.files = {}
+        self.children = {"": (set(), set())}
+        for name, (_, member) in zip(names, members):
+            if not name.startswith(prefix) or name == prefix:
+                continue
+            name = name[len(prefix):]
+            self.files[name] = member
+            parts = name.split("/")
+            for depth in range(len(parts)):
+                parent = "/".join(parts[:depth])
+                self.children.setdefault(parent, (set(), set()))
+                if depth == len(parts) - 1:
+                    self.children[parent][1].add(parts[depth])
+                else:
+                    self.children[parent][0].add(parts[depth])
+        print("i Source archive opened: {} ({} files{})".format(self.location, len(self.files),
+                                                                 ", spooled" if type(self.archive) is not zipfile.ZipFile else ""))
+
+    def getMemberName(self, path):
+        path = os.path.normpath(path)
+        if path == self.location:
+            return ""
+        if path.startswith(self.location + os.sep):
+            return path[len(self.location) + 1:].replace(os.sep, "/")
+        return None
+
+    def isdir(self, path):
+        return self.getMemberName(path) in self.children
+
+    def isfile(self, path):
+        return self.getMemberName(path) in self.files
+
+    def walk(self, top):
+        pending = [self.getMemberName(top)]
+        while pending:
+            directory = pending.pop(0)
+            if directory not in self.children:
+                continue
+            dirs, filenames = self.children[directory]
+            dirs = sorted(dirs)
+            yield (os.path.join(self.location, *directory.split("/")) if directory else self.location,
+                   dirs,
+                   sorted(filenames))
+            pending = ["/".join((directory, entry)) if directory else entry for entry in dirs] + pending
+
+    def open(self, path):
+        import zipfile
+        member = self.files[self.getMemberName(path)]
+        if type(self.archive) is zipfile.ZipFile:
+            return self.archive.open(member)
+        offset, size = member
+        self.archive.seek(offset)
+        return io.BytesIO(self.archive.read(size))
+
+    def copyfile(self, source, destination):
+        import shutil
+        with self.open(source) as source_handle, open(destination, "wb") as destination_handle:
+            shutil.copyfileobj(source_handle, destination_handle)
+
+def openSourceFiles(location):
+    if os.path.isfile(location) and isSourceArchive(location):
+        return ArchiveSource(location)
+    return DirectorySource(location)
+
+def downloadSource(location, destination):
+    import shutil
+    import urllib.request
+    with urllib.request.urlopen(location) as response, open(destination, "wb") as destination_handle:
+        shutil.copyfileobj(response, destination_handle)
+
+def runGit(arguments, cwd = None, stderr = None):
+    import subprocess
+    print("d Running: git {}".format(" ".join(arguments)))
+    return subprocess.run(["git"] + arguments,
+                          cwd = cwd,
+                          stdout = subprocess.PIPE,
+                          stderr = stderr,
+                          universal_newlines = True,
+                          )
+
+def getGitObjectIds(location):
+    "Returns the blob hashes of all tracked files, whose work tree content matches the git index"
+    import subprocess
+    try:
+        toplevel = runGit(["rev-parse", "--show-toplevel"], cwd = location, stderr = subprocess.DEVNULL)
+    except OSError:
+        return {} # git is not installed
+    if toplevel.returncode:
+        return {} # Not a git work tree
+    toplevel = toplevel.stdout.strip()
+    # Only the files below the source, which may be a small part of a large repository
+    pathspec = os.path.relpath(os.path.realpath(location), os.path.realpath(toplevel))
+    if pathspec.startswith(os.pardir):
+        return {}
+
+    staged = runGit(["--literal-pathspecs", "ls-files", "--stage", "-z", "--", pathspec], cwd = toplevel)
+    # Comparing the work tree against the index is cheap, as git checks the cached stat data first
+    modified = runGit(["--literal-pathspecs", "ls-files", "--modified", "-z", "--", pathspec], cwd = toplevel)
+    if staged.returncode or modified.returncode:
+        return {}
+    modified = set(modified.stdout.split("\0"))
+
+    object_ids = {}
+    for line in staged.stdout.split("\0"):
+        if not line:
+            continue
+        stage_info, path = line.split("\t", 1)
+        mode, object_id, stage = stage_info.split(" ")
+        # Only regular files, no symlinks, gitlinks or merge conflicts
+        if not mode.startswith("100") or stage != "0" or path in modified:
+            continue
+        object_ids[os.path.realpath(os.path.join(toplevel, path))] = object_id
+    print("d Using {} object IDs from the git index".format(len(object_ids)))
+    return object_ids
+
+def getSparsePaths(destination):
+    "Returns the directories the creators read from, or None when the whole tree is needed"
+    import json
+    root_entries = runGit(["ls-tree", "--name-only", "HEAD"], cwd = destination).stdout.splitlines()
+    if "__init__.py" in root_entries or package_metadata_filename not in root_entries:
+        # The plugin sources are in the root of the repository
+        return None
+    package_meta = json.loads(runGit(["show", "HEAD:" + package_metadata_filename], cwd = destination).stdout)
+    return ["/".join((package_meta["package_type"], package_meta["package_id"])),
+            package_meta["package_id"],
+            ]
+
+def cloneSparse(location, destination):
+    # Blobless clone without checkout. Blobs are fetched on demand, only for the paths checked out below.
+    import shlex
+    clone = ["clone", "--filter=blob:none", "--no-checkout", "--single-branch", "--depth", "1"]
+    clone += shlex.split(args.gitargs) + [location, destination]
+    if runGit(clone).returncode:
+        return False
+
+    sparse_paths = getSparsePaths(destination)
+    if sparse_paths:
+        # Cone mode always includes the files in the root, like package.json and LICENSE
+        if runGit(["sparse-checkout", "init", "--cone"], cwd = destination).returncode:
+            return False
+        if runGit(["sparse-checkout", "set"] + sparse_paths, cwd = destination).returncode:
+            return False
+    if runGit(["checkout"], cwd = destination).returncode:
+        return False
+
+    # Submodules outside of the sparse paths are never read
+    submodule_paths = []
+    if os.path.isfile(os.path.join(destination, ".gitmodules")):
+        submodule_config = runGit(["config", "--file", ".gitmodules", "--get-regexp", r"^submodule\..*\.path$"], cwd = destination)
+        for line in submodule_config.stdout.splitlines():
+            submodule_path = line.split(" ", 1)[1]
+            if not sparse_paths or [sparse_path for sparse_path in sparse_paths if (submodule_path + "/").startswith(sparse_path + "/")]:
+                submodule_paths.append(submodule_path)
+            else:
+                print("d Skipping submodule outside of the sparse checkout: {}".format(submodule_path))
+    if submodule_paths:
+        submodules = ["submodule", "update", "--init", "--recursive", "--depth", "1", "--jobs", str(args.gitjobs), "--"] + submodule_paths
+        if runGit(submodules, cwd = destination).returncode:
+            return False
+
+    return True
+
+def getSource(location):
+    from urllib.parse import urlparse
+    if os.path.isdir(location):
+        return location
+
+    if os.path.isfile(location) and isSourceArchive(location):
+        return location
+
+    if isUrlAddress(location):
+        if location.endswith(".git"):
+            downloaddir = createWorkDirectory(args.downloaddir)
+            if args.gitmode == "sparse":
+                if cloneSparse(location, downloaddir):
+                    return downloaddir
+                return None
+            ret = os.system("git clone {} --single-branch --depth 1 --recurse-submodules --shallow-submodules --jobs {} {} {}".format(args.gitargs, args.gitjobs, location, downloaddir))
+            if not ret:
+                return downloaddir
+        elif isSourceArchive(urlparse(location).path):
+            # Only the archive itself is stored, its contents are read from it directly
+            downloaddir = createWorkDirectory(args.downloaddir)
+            archive_file = os.path.join(downloaddir, os.path.basename(urlparse(location).path))
+            try:
+                downloadSource(location, archive_file)
+            except OSError as error:
+                print("e Download failed: {}".format(error))
+                return None
+            return archive_file
+
+    return None
+
+class CreatorCommon():
+    default_result_extension = ""
+    target_sdk = None # as declared in the package metadata
+    target_api = None # as declared in the plugin metadata
+
+    def __init__(self, args):
+        import zipfile
+        self.__args = args
+
+        # Getting the real paths
+        self.source_dir = os.path.realpath(args.source)
+        self.build_dir = os.path.realpath(args.build)
+        self.build_base = os.path.realpath(args.build_base)
+        self.source_files = args.source_files
+        self.result_dir = args.destination
+        self._result_name = args.result
+        self.result_extension = None
+
+        self.compression_auto = args.compression == "auto"
+        self.compression_budget = args.compression_budget
+        self.compression_report = None
+        if self.compression_auto:
+            self.compression = zipfile.ZIP_DEFLATED # until tuned
+        elif args.compression not in compression_methods.keys():
+            print("Unknown compression format!")
+        else:
+            self.compression = compression_methods[args.compression]
+        self.compression_level = args.level
+        self.variant = args.variant
+        self.layout = args.layout
+        self.incremental = args.incremental
+        self.entry_cache = args.entry_cache
+        self.write_index = args.index or args.incremental # The index tells, which entries can be reused
+        self.write_manifest = args.manifest or bool(args.sign_key)
+        self.sign_key = args.sign_key
+        self.sign_method = args.sign_method
+        self.write_size_report = args.size_report
+        self.size_report_top = args.size_report_top
+        self.size_report_baseline = args.size_report_baseline
+        self.size_report_threshold = args.size_report_threshold
+        self.force = args.force
+        self.write_import_report = args.import_report or args.import_timing
+        self.import_timing = args.import_timing
+        self.vendored = args.vendored.split(os.pathsep) if args.vendored else []
+        self.plugin_build_dir = None
+        self.zipimport = args.zipimport
+        self.delta_from = args.delta_from
+        self.fingerprint = None
+
+    @property
+    def result_name(self):
+        raise ValueError("result_name not implemented!")
+
+    def verify(self):
+        # Test, whether we can determine the plugin's file extension
+        import importlib.util
+        try:
+            self.result_name
+        except Exception:
+            print("E Raised error, when trying to call self.result_name")
+            return False
+
+        # Test, whether there is something to create the delta from
+        if self.delta_from and not os.path.exists(self.delta_from):
+            print("e Package or directory to create the delta from not found: {}".format(self.delta_from))
+            return False
+
+        # Test, whether we are able to sign the manifest at the end
+        if self.sign_key:
+            if not os.path.isfile(self.sign_key):
+                print("e Key file for signing the manifest not found!")
+                return False
+            if self.sign_method == "ed25519" and not importlib.util.find_spec("cryptography"):
+                print("e Signing with Ed25519 requires the cryptography package!")
+                return False
+
+        return True
+
+    def prepare(self):
+        raise ValueError("prepare not implemented!")
+
+    def build(self):
+        raise ValueError("build not implemented!")
+
+    def findDeltaBase(self):
+        if not self.delta_from or os.path.isfile(self.delta_from):
+            return self.delta_from
+
+        # Previous versions of the same target inside a directory.
+        # Matching the version too, so plugin "Demo" doesn't pick up "Demo-Extra-1.0.0.curapackage"
+        import re
+        prefix = "{}-".format(self.plugin_meta["id"])
+        suffix = os.path.basename(self.result_name)[len(prefix) + len(self.plugin_meta["version"]):]
+        pattern = re.compile(re.escape(prefix) + delta_base_version_pattern + re.escape(suffix))
+        candidates = [os.path.join(self.delta_from, filename) for filename in os.listdir(self.delta_from)
+                      if pattern.fullmatch(filename) and filename != os.path.basename(self.result_name)]
+        if not candidates:
+            return None
+        return max(candidates, key = os.path.getmtime)
+
+    def createDelta(self):
+        base_file = self.findDeltaBase()
+        if not base_file:
+            print("w No previous package found to create a delta from!")
+            return
+        delta_file = self.result_name + delta_extension
+        if isDeltaUpToDate(base_file, self.result_name, delta_file):
+            print("i Delta unchanged, reusing: {}".format(delta_file))
+            return
+        createDelta(base_file, self.result_name, delta_file)
+
+    def publish(self, publisher):
+        # Queues the result and its sidecars. Uploaded all together at the end of the run.
+        publisher.add(self.result_name)
+        for extension in archive_sidecar_extensions + (import_report_extension, delta_extension):
+            if os.path.isfile(self.result_name + extension):
+                publisher.add(self.result_name + extension)
+
+    def analyze(self):
+        # Optional stage, analyzing the plugin's sources and importing the built plugin
+        if self.write_import_report:
+            self.analyzeImports()
+
+    def bundle(self):
+        raise ValueError("bundle not implemented!")
+
+    def test(self):
+        raise ValueError("test not implemented!")
+
+    def clean(self):
+        raise ValueError("clean not implemented!")
+
+    def loadJsonFile(self, location):
+        import json
+        json_file = self.source_files.open(location)
+        result = json.load(json_file)
+        json_file.close()
+        return result
+
+    def isPackageMeta(self, location = None):
+        if not location:
+            location = os.path.join(self.source_dir)
+        if self.source_files.isdir(location):
+            location = os.path.join(location, package_metadata_filename)
+        return self.source_files.isfile(location)
+
+    def loadPackageMeta(self, location = None):
+        if not location:
+            location = os.path.join(self.source_dir)
+        if self.source_files.isdir(location):
+            location = os.path.join(location, package_metadata_filename)
+        self.package_meta = self.loadJsonFile(location)
+        return self.package_meta
+
+    def isPluginMeta(self, location = None):
+        if not location:
+            location = os.path.join(self.source_dir)
+        if self.source_files.isdir(location):
+            location = os.path.join(location, plugin_metadata_filename)
+        return self.source_files.isfile(location)
+
+    def loadPluginMeta(self, location = None):
+        if not location:
+            location = os.path.join(self.source_dir)
+        if self.source_files.isdir(location):
+            location = os.path.join(location, plugin_metadata_filename)
+        self.plugin_meta = self.loadJsonFile(location)
+        return self.plugin_meta
+
+    def findLicenseFile(self, directory):
+        result = None
+        license_locations = [self.package_location, self.plugin_location]
+        if directory not in license_locations:
+            license_locations.append(directory)
+        for license_location in license_locations:
+            for license_filename in license_filenames:
+                license_filepath = os.path.join(license_location, license_filename)
+                if self.source_files.isfile(license_filepath):
+                    result = license_filepath
+                    break
+            if result:
+                break
+        if not result:
+            print("e LICENSE file not found!")
+            return False
+
+        self.license_file = result
+        print("d Verify: LICENSE file found at: {}".format(result))
+        return True
+
+    def installLicenseFile(self, build_path):
+        print("d Installing license file")
+        self.source_files.copyfile(self.license_file,
+                                   os.path.join(build_path, os.path.basename(self.license_file)))
+
+    def hashSourceFile(self, location):
+        # Unchanged files in a git work tree are already hashed by git
+        import hashlib
+        object_id = self.source_files.getObjectId(location)
+        if object_id:
+            return "git:" + object_id
+        digest = hashlib.sha256()
+        with self.source_files.open(location) as source_handle:
+            for chunk in iter(lambda: source_handle.read(1 << 16), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def getSourceManifest(self):
+        # All files, which can make it into the result
+        manifest = {}
+        for root, dirs, filenames in self.source_files.walk(self.plugin_location):
+            for filename in filenames:
+                fullname = os.path.join(root, filename)
+                relative_filename = os.path.relpath(fullname, self.plugin_location)
+                if self.checkForIgnorableFiles(self.plugin_location, relative_filename):
+                    continue
+                manifest[relative_filename.replace(os.sep, "/")] = self.hashSourceFile(fullname)
+        if self.license_file:
+            manifest[":license"] = self.hashSourceFile(self.license_file)
+        return manifest
+
+    def getFingerprint(self):
+        import hashlib
+        import importlib.util
+        import json
+        inputs = {"creator": type(self).__name__,
+                  "version": cpo_version,
+                  "oven": getOvenHash(),
+                  "python": importlib.util.MAGIC_NUMBER.hex(), # Bytecode of another Python version can't be reused
+                  "package_meta": self.package_meta,
+                  "plugin_meta": self.plugin_meta,
+                  "options": {"variant": self.variant,
+                              "compression": "auto" if self.compression_auto else self.compression,
+                              "compression_level": self.compression_level,
+                              "compression_budget": self.compression_budget if self.compression_auto else None,
+                              "optimize": args.optimize,
+                              "layout": self.layout,
+                              "target_sdk": self.target_sdk,
+                              "target_api": self.target_api,
+                              "result_extension": self.result_extension,
+                              "index": self.write_index,
+                              "manifest": self.write_manifest,
+                              "sign_key": self.hashSourceFile(self.sign_key) if self.sign_key else None,
+                              "sign_method": self.sign_method,
+                              "size_report": self.write_size_report,
+                              "size_report_top": self.size_report_top if self.write_size_report else None,
+                              "size_report_threshold": self.size_report_threshold if self.write_size_report else None,
+                              # Only an explicit baseline, the default one is the report written by the last build
+                              "size_report_baseline": hashFile(self.size_report_baseline) if self.write_size_report and self.size_report_baseline and os.path.isfile(self.size_report_baseline) else None,
+                              "import_report": self.write_import_report,
+                              "import_timing": self.import_timing,
+                              "vendored": self.vendored,
+                              "zipimport": self.zipimport,
+                              },
+                  "sources": self.getSourceManifest(),
+                  }
+        return hashlib.sha256(json.dumps(inputs, sort_keys = True).encode("utf-8")).hexdigest()
+
+    def isUpToDate(self):
+        import json
+        self.fingerprint = self.getFingerprint()
+        if self.force:
+            return False
+
+        # The result and all requested sidecars must be there
+        expected_files = [self.result_name]
+        if self.write_index:
+            expected_files.append(self.result_name + archive_index_extension)
+        if self.write_manifest:
+            expected_files.append(self.result_name + archive_manifest_extension)
+        if self.sign_key:
+            expected_files.append(self.result_name + archive_manifest_extension + archive_signature_extension)
+        if self.write_size_report:
+            expected_files.append(self.result_name + archive_size_report_extension)
+        if self.write_import_report:
+            expected_files.append(self.result_name + import_report_extension)
+        expected_files.append(self.result_name + archive_fingerprint_extension)
+        for expected_file in expected_files:
+            if not os.path.isfile(expected_file):
+                return False
+
+        with open(self.result_name + archive_fingerprint_extension) as fingerprint_handle:
+            try:
+                stored = json.load(fingerprint_handle)
+            except ValueError:
+                return False
+        return stored.get("fingerprint") == self.fingerprint
+
+    def writeFingerprint(self):
+        import json
+        fingerprint_file = self.result_name + archive_fingerprint_extension
+        temporary_file = createTemporaryFile(fingerprint_file)
+        with open(temporary_file, "w") as fingerprint_handle:
+            fingerprint_handle.write(json.dumps({"fingerprint": self.fingerprint,
+                                                 "version": cpo_version,
+                                                 },
+                                                indent = 4,
+                                                )
+            )
+        os.replace(temporary_file, fingerprint_file)
+        print("d Fingerprint written: {}".format(fingerprint_file))
+
+    def getPythonModules(self):
+        # Module name -> (relative filename, source)
+        # Read from the sources, as the build directory holds only bytecode for --variant=binary
+        plugin_id = self.plugin_meta["id"]
+        modules = {}
+        for root, dirs, filenames in self.source_files.walk(self.plugin_location):
+            for filename in filenames:
+                if os.path.splitext(filename)[1] not in python_sources:
+                    continue
+                fullname = os.path.join(root, filename)
+                relative_filename = os.path.relpath(fullname, self.plugin_location)
+                if self.checkForIgnorableFiles(self.plugin_location, relative_filename):
+                    continue
+                parts = [plugin_id] + os.path.splitext(relative_filename)[0].split(os.sep)
+                if parts[-1] == "__init__":
+                    parts = parts[:-1]
+                with self.source_files.open(fullname) as source_handle:
+                    modules[".".join(parts)] = (relative_filename.replace(os.sep, "/"), source_handle.read())
+        return modules
+
+    def isVendoredModule(self, relative_filename):
+        # Returns the vendored package (directory or module directly inside the vendor directory)
+        parts = relative_filename.split("/")
+        vendor_depth = None
+        for vendored in self.vendored:
+            vendored_parts = vendored.replace(os.sep, "/").strip("/").split("/")
+            if parts[:len(vendored_parts)] == vendored_parts and len(parts) > len(vendored_parts):
+                vendor_depth = len(vendored_parts)
+                break
+        if vendor_depth is None:
+            for depth, part in enumerate(parts[:-1]):
+                if part.lower() in vendored_directories:
+                    vendor_depth = depth + 1
+                    break
+        if vendor_depth is None:
+            return None
+        return "/".join(parts[:vendor_depth + 1])
+
+    def getImportedNames(self, node):
+        # Imports executed at import time. Function bodies only run when called.
+        import ast
+        eager = []
+        lazy = []
+        def visit(node, eager_context):
+            for child in ast.iter_child_nodes(node):
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+                    visit(child, False)
+                    continue
+                if isinstance(child, (ast.Import, ast.ImportFrom)):
+                    (eager if eager_context else lazy).append(child)
+                visit(child, eager_context)
+        visit(node, True)
+        return eager, lazy
+
+    def resolveImport(self, node, module_name, modules, top_level_names):
+        # Returns the names of all modules, which get imported by the statement
+        import ast
+        is_package = module_name == self.plugin_meta["id"] or modules[module_name][0].endswith("__init__.py")
+        if isinstance(node, ast.Import):
+            requested = [(alias.name, []) for alias in node.names]
+        elif node.level:
+            package = module_name.split(".")
+            if not is_package:
+                package = package[:-1]
+            if node.level > 1:
+                package = package[:-(node.level - 1)]
+            base = ".".join(package + ([node.module] if node.module else []))
+            requested = [(base, [alias.name for alias in node.names])]
+        else:
+            requested = [(node.module, [alias.name for alias in node.names])]
+
+        imported = []
+        for name, from_names in requested:
+            top_level = name.split(".")[0]
+            if node.__class__ is ast.ImportFrom and node.level:
+                local_name = name
+            elif top_level in top_level_names:
+                local_name = ".".join([top_level_names[top_level]] + name.split(".")[1:])
+            else:
+                imported.append(name)
+                continue
+            # Importing a.b.c runs a, a.b and a.b.c
+            parts = local_name.split(".")
+            for depth in range(1, len(parts) + 1):
+                imported.append(".".join(parts[:depth]))
+            for from_name in from_names:
+                if ".".join((local_name, from_name)) in modules:
+                    imported.append(".".join((local_name, from_name)))
+        return imported
+
+    def analyzeImports(self):
+        import ast
+        import json
+        import marshal
+        plugin_id = self.plugin_meta["id"]
+        modules = self.getPythonModules()
+
+        # Names, which resolve to modules inside the plugin when imported absolutely
+        stdlib_modules = getattr(sys, "stdlib_module_names", ())
+        top_level_names = {plugin_id: plugin_id}
+        for module_name, (relative_filename, source) in modules.items():
+            parts = module_name.split(".")
+            if len(parts) < 2:
+                continue
+            vendored = self.isVendoredModule(relative_filename)
+            if vendored:
+                # Packages inside a vendor directory get added to sys.path by the plugin
+                vendored_parts = os.path.splitext(vendored)[0].split("/")
+                top_level_names.setdefault(vendored_parts[-1], ".".join([plugin_id] + vendored_parts))
+            elif parts[1] not in stdlib_modules:
+                top_level_names.setdefault(parts[1], ".".join(parts[:2]))
+
+        graph = {}
+        report = {"plugin": plugin_id,
+                  "startup_modules": [],
+                  "startup_bytecode_size": 0,
+                  "eager_vendored_packages": 0,
+                  "vendored_packages": {},
+                  "external_imports": {},
+                  "modules": {},
+                  }
+        for module_name, (relative_filename, source) in modules.items():
+            try:
+                tree = ast.parse(source, relative_filename)
+                bytecode_size = len(marshal.dumps(compile(tree, relative_filename, "exec"))) + 16 # pyc header
+            except SyntaxError as error:
+                print("w Could not parse {}: {}".format(relative_filename, error))
+                tree = ast.Module(body = [], type_ignores = [])
+                bytecode_size = 0
+            eager, lazy = self.getImportedNames(tree)
+            eager_imports = []
+            for node in eager:
+                eager_imports += self.resolveImport(node, module_name, modules, top_level_names)
+            lazy_imports = []
+            for node in lazy:
+                lazy_imports += self.resolveImport(node, module_name, modules, top_level_names)
+            graph[module_name] = sorted(set(eager_imports))
+            report["modules"][module_name] = {"file": relative_filename,
+                                              "bytecode_size": bytecode_size,
+                                              "eager_imports": sorted(set(eager_imports)),
+                                              "lazy_imports": sorted(set(lazy_imports) - set(eager_imports)),
+                                              }
+
+        # Everything reachable from __init__.py via eager imports runs on startup
+        startup = set()
+        pending = [plugin_id]
+        while pending:
+            module_name = pending.pop()
+            if module_name in startup:
+                continue
+            startup.add(module_name)
+            for imported in graph.get(module_name, []):
+                if imported in modules:
+                    pending.append(imported)
+                elif imported.split(".")[0] != plugin_id:
+                    top_level = imported.split(".")[0]
+                    report["external_imports"][top_level] = report["external_imports"].get(top_level, 0) + 1
+        report["startup_modules"] = sorted(startup & set(modules.keys()))
+        report["startup_bytecode_size"] = sum([report["modules"][module_name]["bytecode_size"] for module_name in report["startup_modules"]])
+
+        for module_name, module_report in report["modules"].items():
+            vendored = self.isVendoredModule(module_report["file"])
+            if not vendored:
+                continue
+            package = report["vendored_packages"].setdefault(vendored, {"modules": 0,
+                                                                        "bytecode_size": 0,
+                                                                        "startup_modules": 0,
+                                                                        "startup_bytecode_size": 0,
+                                                                        })
+            package["modules"] += 1
+            package["bytecode_size"] += module_report["bytecode_size"]
+            if module_name in startup:
+                package["startup_modules"] += 1
+                package["startup_bytecode_size"] += module_report["bytecode_size"]
+        report["eager_vendored_packages"] = len([package for package in report["vendored_packages"].values() if package["startup_modules"]])
+
+        print("i Import cost: {} of {} modules run on startup, {} bytes of bytecode".format(len(report["startup_modules"]),
+                                                                                          len(modules),
+                                                                                          report["startup_bytecode_size"]))
+        for vendored, package in sorted(report["vendored_packages"].items()):
+            if package["startup_modules"]:
+                print("w Import cost: Vendored package imported eagerly: {} ({} modules, {} bytes of bytecode)".format(vendored,
+                                                                                                                       package["startup_modules"],
+                                                                                                                       package["startup_bytecode_size"]))
+
+        if self.import_timing:
+            report["timing"] = self.measureImportTime()
+
+        report_file = self.result_name + import_report_extension
+        temporary_file = createTemporaryFile(report_file)
+        with open(temporary_file, "w") as report_handle:
+            report_handle.write(json.dumps(report,
+                                           indent = 4,
+                                           )
+            )
+        os.replace(temporary_file, report_file)
+        print("i Import report written: {}".format(report_file))
+
+    # Puts the vendored archives on sys.path and makes them importable as subpackages
+    ZIPIMPORT_BOOTSTRAP = """# Generated by CuraPluginOven
+import importlib.util, os, sys, zipimport
+
+for _directory in {directories}:
+    _archive = os.path.join(os.path.dirname(os.path.abspath(__file__)), *_directory.split("/")) + ".zip"
+    if _archive not in sys.path:
+        sys.path.insert(0, _archive)
+    _name = ".".join([__package__] + _directory.split("/"))
+    if _name not in sys.modules and all([_part.isidentifier() for _part in _directory.split("/")]):
+        _module = importlib.util.module_from_spec(importlib.util.spec_from_loader(_name, None, is_package = True))
+        _module.__path__ = [_archive]
+        sys.modules[_name] = _module
+        _importer = zipimport.zipimporter(_archive)
+        try:
+            _code = _importer.get_code("__init__")
+        except zipimport.ZipImportError:
+            _code = None
+        if _code:
+            exec(_code, _module.__dict__)
+"""
+
+    def getVendoredDirectories(self, build_path):
+        if self.vendored:
+            return [vendored.replace(os.sep, "/").strip("/") for vendored in self.vendored]
+        return sorted([entry for entry in os.listdir(build_path)
+                       if entry.lower() in vendored_directories and os.path.isdir(os.path.join(build_path, entry))])
+
+    def getPycData(self, filename_build, arcname, optimize = -1):
+        # Sourceless bytecode, as zipimport expects it next to the module
+        import importlib.util
+        import marshal
+        import struct
+        with open(filename_build, "rb") as source_handle:
+            source = source_handle.read()
+        code = compile(source, arcname, "exec", dont_inherit = True, optimize = optimize)
+        return (importlib.util.MAGIC_NUMBER
+                + struct.pack("<III", 0, int(os.stat(filename_build).st_mtime) & 0xFFFFFFFF, len(source) & 0xFFFFFFFF)
+                + marshal.dumps(code))
+
+    def bundleVendoredPackages(self, build_path, optimize = -1):
+        import shutil
+        import zipfile
+        if self.zipimport == "none":
+            return
+
+        directories = []
+        for directory in self.getVendoredDirectories(build_path):
+            vendored_path = os.path.join(build_path, *directory.split("/"))
+            if not os.path.isdir(vendored_path):
+                print("w Vendored directory not found: {}".format(directory))
+                continue
+
+            archive_file = vendored_path + ".zip"
+            files = 0
+            with zipfile.ZipFile(archive_file, "w", compression = zipfile.ZIP_STORED) as zip_object:
+                for root, dirs, filenames in os.walk(vendored_path):
+                    dirs.sort()
+                    if "__pycache__" in dirs: # zipimport does not look into __pycache__
+                        dirs.remove("__pycache__")
+                    for filename in sorted(filenames):
+                        filename_build = os.path.join(root, filename)
+                        arcname = os.path.relpath(filename_build, vendored_path).replace(os.sep, "/")
+                        if self.zipimport == "pyc" and os.path.splitext(filename)[1] in python_sources:
+                            arcname = os.path.splitext(arcname)[0] + ".pyc"
+                            zip_object.writestr(self.getZipInfo(arcname, filename_build),
+                                                self.getPycData(filename_build, "/".join((directory, arcname[:-1])), optimize = optimize),
+                                                compress_type = zipfile.ZIP_STORED)
+                        else:
+                            zip_object.write(filename_build, arcname,
+                                             compress_type = zipfile.ZIP_STORED)
+                        files += 1
+            shutil.rmtree(vendored_path)
+            directories.append(directory)
+            print("i Vendored packages bundled for zipimport: {} ({} files)".format(directory, files))
+
+        if directories:
+            self.installZipimportBootstrap(build_path, directories)
+
+    def installZipimportBootstrap(self, build_path, directories):
+        import ast
+        with open(os.path.join(build_path, zipimport_bootstrap_module + ".py"), "w") as bootstrap_handle:
+            bootstrap_handle.write(self.ZIPIMPORT_BOOTSTRAP.format(directories = repr(directories)))
+
+        # The bootstrap needs to run before anything else of the plugin
+        init_file = os.path.join(build_path, "__init__.py")
+        with open(init_file) as init_handle:
+            source = init_handle.read()
+        lines = source.splitlines(True)
+        insert_at = 0
+        for node in ast.parse(source).body:
+            is_docstring = isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and type(node.value.value) is str
+            is_future = isinstance(node, ast.ImportFrom) and node.module == "__future__"
+            if not (is_docstring and insert_at == 0) and not is_future:
+                break
+            insert_at = node.end_lineno
+        lines.insert(insert_at, "from . import {} # Generated by CuraPluginOven\n".format(zipimport_bootstrap_module))
+        with open(init_file, "w") as init_handle:
+            init_handle.write("".join(lines))
+        print("d Installed zipimport bootstrap")
+
+    # Imports the built plugin with stubs for Uranium and Cura
+    IMPORT_TIMING_SCRIPT = """
+import importlib.abc, importlib.machinery, importlib.util, json, sys, time, types
+
+class StubType(type):
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return StubType(name, (Stub,), {})
+
+class Stub(metaclass = StubType):
+    def __init__(self, *args, **kwargs):
+        pass
+    def __call__(self, *args, **kwargs):
+        return Stub()
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return Stub()
+
+class StubModule(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return StubType(name, (Stub,), {})
+
+class StubFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def find_spec(self, fullname, path, target = None):
+        if fullname.split(".")[0] in HOST_MODULES:
+            return importlib.machinery.ModuleSpec(fullname, self, is_package = True)
+    def create_module(self, spec):
+        module = StubModule(spec.name)
+        module.__path__ = []
+        return module
+    def exec_module(self, module):
+        pass
+
+HOST_MODULES = sys.argv[3].split(",")
+sys.meta_path.insert(0, StubFinder())
+started = time.perf_counter()
+spec = importlib.util.spec_from_file_location(sys.argv[2], sys.argv[1] + "/__init__.py",
+                                              submodule_search_locations = [sys.argv[1]])
+module = importlib.util.module_from_spec(spec)
+sys.modules[sys.argv[2]] = module
+spec.loader.exec_module(module)
+print(json.dumps({"import_time": time.perf_counter() - started}))
+"""
+
+    def getPythonInterpreter(self):
+        import shutil
+        if not getattr(sys, "frozen", False):
+            return sys.executable
+        # sys.executable is cpo itself, when frozen via cx_Freeze
+        for name in ("python3", "python"):
+            interpreter = shutil.which(name)
+            if interpreter:
+                return interpreter
+        return None
+
+    def measureImportTime(self):
+        import json
+        import subprocess
+        plugin_id = self.plugin_meta["id"]
+        timing = {"import_time": None,
+                  "modules": {},
+                  }
+        interpreter = self.getPythonInterpreter()
+        if not interpreter:
+            timing["error"] = "No Python interpreter found"
+            print("w Import timing skipped: No Python interpreter found")
+            return timing
+
+        result = subprocess.run([interpreter, "-X", "importtime", "-c", self.IMPORT_TIMING_SCRIPT,
+                                 self.plugin_build_dir, plugin_id, ",".join(host_modules)],
+                                stdout = subprocess.PIPE,
+                                stderr = subprocess.PIPE,
+                                universal_newlines = True,
+                                )
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            fields = [field.strip() for field in line[len("import time:"):].split("|")]
+            if not fields[0].isdigit():
+                continue
+            module_name = fields[2]
+            if module_name == plugin_id or module_name.startswith(plugin_id + "."):
+                timing["modules"][module_name] = {"self_us": int(fields[0]),
+                                                  "cumulative_us": int(fields[1]),
+                                                  }
+        if result.returncode:
+            timing["error"] = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "exit code {}".format(result.returncode)
+            print("w Import timing failed: {}".format(timing["error"]))
+            return timing
+
+        timing["import_time"] = json.loads(result.stdout.strip().splitlines()[-1])["import_time"]
+        print("i Import time: {:.1f} ms".format(timing["import_time"] * 1000))
+        return timing
+
+    def cleanUpBuildDirectory(self, build_path):
+        import shutil
+        if os.path.isdir(build_path):
+            shutil.rmtree(build_path)
+        print("i Build directory removed!")
+
+    def prepareBuildDirectory(self, build_path, cleanup_before_creation = True):
+        if cleanup_before_creation:
+            self.cleanUpBuildDirectory(build_path)
+
+        os.makedirs(build_path,
+                    exist_ok = True)
+
+        print("i Build directory prepared!")
+
+    def checkForIgnorableFiles(self, base_path, relative_filename):
+        print("d Checking whether file can be ignored: {}".format(relative_filename))
+        checked_entries = []
+        for entry in relative_filename.split(os.sep):
+            # TODO: Implement args.exclude here
+            if entry.startswith("."): # dot files and directories
+                return True
+            this_path = os.path.join(base_path, *checked_entries, entry)
+            if this_path == os.path.split(__file__)[0]: # Filtering out CPO itself
+                return True
+            if this_path.startswith(self.build_base): # Ignore the build dirs of all runs inside source dir
+                return True
+            if entry.lower() in test_directories and self.source_files.isdir(this_path): # test directories
+                return True
+            if self.source_files.isfile(this_path):
+                for extension in excluded_extentions:
+                    if entry.endswith(extension):
+                        return True
+            checked_entries.append(entry)
+        return False
+
+    def compileAllPySources(self, source, build, variant, optimize = -1):
+        import compileall
+        # zip_handle is zipfile handle
+        for root, dirs, filenames in self.source_files.walk(source):
+            for filename in filenames:
+                fullname = os.path.join(root, filename)
+                relative_filename = os.path.relpath(fullname, source)
+                if self.checkForIgnorableFiles(source, relative_filename):
+                    continue
+                _, extension = os.path.splitext(filename)
+                if extension in python_sources:
+                    destdir = os.path.join(build,
+                                           relative_filename)
+                    destdir = os.path.split(destdir)[0]
+                    os.makedirs(destdir, exist_ok = True)
+                    if variant in ("binary+source", "source", "binary"):
+                        filename_copied = "{}/{}".format(destdir, filename)
+                        self.source_files.copyfile(fullname,
+                                                   filename_copied
+                                                   )
+                        os.chmod(filename_copied, 0o600)
+                        print("d Copying: {}".format(relative_filename))
+                        if variant in ("binary+source", "binary"):
+                            compileall.compile_file(filename_copied,
+                                                ddir = relative_filename,
+                                                quiet = 2,
+                                                optimize = optimize,
+                                                )
+                            print("d Compiled: {}".format(relative_filename))
+                        if variant is "binary":
+                            if relative_filename != "__init__.py":
+                                print("d Removing: {}".format(relative_filename))
+                                os.remove(filename_copied)
+                    else:
+                        print("e Invalid variant!")
+        print("i Python files compiled and optionally copied source(s)!")
+
+    def copyOtherFiles(self, source, build, ignore_dot_files = True):
+        # zip_handle is zipfile handle
+        for root, dirs, filenames in self.source_files.walk(source):
+            for filename in filenames:
+                if filename.startswith(".") and ignore_dot_files: # dot files
+                    continue
+                if filename in system_files: # system files
+                    continue
+                if filename in license_filenames: # license files
+                    continue
+                if filename in metadata_filenames: # metadata files
+                    continue
+                if os.path.splitext(filename)[1] in python_files: # python files
+                    continue
+                fullname = os.path.join(root, filename)
+                relative_filename = os.path.relpath(fullname, source)
+                if self.checkForIgnorableFiles(source, relative_filename):
+                    continue
+                print("d Copying: {}".format(relative_filename))
+
+                destdir = os.path.split(os.path.join(build,
+                                                     relative_filename,
+                                                     )
+                                        )[0]
+                os.makedirs(destdir, exist_ok = True)
+                filename_copied = os.path.join(destdir, filename)
+                self.source_files.copyfile(fullname,
+                                           filename_copied
+                                           )
+                os.chmod(filename_copied, 0o600)
+        print("i Copied other files!")
+
+    def buildPluginMetadata(self, location = None, sort_keywords = False, api = None):
+        import json
+        if not location:
+            location = self.build_dir
+        if os.path.isdir(location):
+            location = os.path.join(location, plugin_metadata_filename)
+
+        metadata = self.plugin_meta.copy()
+        if api:
+            metadata["api"] = self.target_api
+        elif self.target_api:
+            metadata["api"] = self.target_api
+
+        # Filtering out some custom keywords
+        if "minimum_api" in metadata.keys():
+            del metadata["minimum_api"]
+
+        with open(location, "w") as metadata_file:
+            metadata_file.write(json.dumps(metadata,
+                                           sort_keys = sort_keywords,
+                                           indent = 4,
+                                           )
+            )
+
+    def buildPackageMetadata(self, location = None, sort_keywords = False):
+        import json
+        if not location:
+            location = self.build_dir
+        if os.path.isdir(location):
+            location = os.path.join(location, package_metadata_filename)
+        metadata = self.package_meta.copy()
+
+        if self.target_sdk:
+            if type(self.target_sdk) in (tuple, list):
+                metadata["sdk_version"] = self.target_sdk[0]
+            elif type(self.target_sdk) is int:
+                metadata["sdk_version"] = self.target_sdk
+            else:
+                raise ValueError("Wrong data type of target_sdk!")
+
+        # Remove sdk_version_semver from older packages
+        if metadata["sdk_version"] <= 5 and "sdk_version_semver" in metadata.keys():
+            del metadata["sdk_version_semver"]
+        
+        if "sdk_version_semver" in metadata.keys() and type(self.target_sdk) in (tuple, list):
+            _sdk_version_semver = ".".join([str(target_sdk) for target_sdk in self.target_sdk])
+            if _sdk_version_semver in self.plugin_meta["supported_sdk_versions"]:
+                metadata["sdk_version_semver"] = _sdk_version_semver
+
+        # Filtering out some old keywords
+        if "tags" in metadata.keys() and metadata["sdk_version"] >= 6:
+            del metadata["tags"]
+
+        with open(location, "w") as metadata_file:
+            metadata_file.write(json.dumps(metadata,
+                                           sort_keys = sort_keywords,
+                                           indent = 4,
+                                           )
+            )
+
+    def collectBuildEntries(self, build_dir, prefix = None):
+        # Entries are tuples of (name inside the archive, file on disk, data)
+        entries = []
+        for root, dirs, filenames in os.walk(build_dir):
+            for file in filenames:
+                filename_build = os.path.join(root, file)
+                arcname = os.path.relpath(filename_build, build_dir).replace(os.sep, "/")
+                if prefix:
+                    arcname = "/".join((prefix, arcname))
+                entries.append((arcname, filename_build, None))
+        return entries
+
+    def isArchiveMetadata(self, arcname):
+        if arcname.endswith("/"): # directory entries
+            return True
+        if arcname.startswith("_rels/"): # OPC relationships
+            return True
+        return arcname.split("/")[-1] in archive_metadata_filenames
+
+    def orderArchiveEntries(self, entries):
+        if self.layout != "metadata-first":
+            return entries
+
+        # Metadata first, in the order given, everything else grouped by directory
+        metadata_entries = [entry for entry in entries if self.isArchiveMetadata(entry[0])]
+        other_entries = [entry for entry in entries if not self.isArchiveMetadata(entry[0])]
+        other_entries.sort(key = lambda entry: entry[0].rsplit("/", 1) if "/" in entry[0] else ["", entry[0]])
+        return metadata_entries + other_entries
+
+    def getZipInfo(self, arcname, filename_build = None):
+        import zipfile
+        if filename_build:
+            file_stat = os.stat(filename_build)
+            zipinfo = zipfile.ZipInfo(arcname, time.localtime(file_stat.st_mtime)[0:6])
+            zipinfo.external_attr = file_stat[ST_MODE] << 16
+        else:
+            zipinfo = zipfile.ZipInfo(arcname, time.localtime(time.time())[0:6])
+            if arcname.endswith("/"):
+                zipinfo.external_attr = 0o40775 << 16 | 0x10 # MS-DOS directory flag
+            else:
+                zipinfo.external_attr = 0o600 << 16
+
+        if arcname.endswith("/"):
+            # We need to tell zip to not compress the folder!
+            zipinfo.compress_type = zipfile.ZIP_STORED
+        elif self.layout == "metadata-first" and self.isArchiveMetadata(arcname):
+            # Metadata stays uncompressed to be readable with a single ranged read
+            zipinfo.compress_type = zipfile.ZIP_STORED
+        else:
+            zipinfo.compress_type = self.compression
+        return zipinfo
+
+    def writeArchive(self, archive_file, entries):
+        # Writing next to the destination and publishing it atomically afterwards
+        if self.compression_auto:
+            self.tuneCompression(entries)
+
+        temporary_file = createTemporaryFile(archive_file)
+        sidecar_extensions = []
+        try:
+            written_entries = self.writeArchiveEntries(temporary_file, entries,
+                                                       previous_file = archive_file if self.incremental else None)
+            if self.write_index:
+                self.writeArchiveIndex(temporary_file, written_entries, archive_file)
+                sidecar_extensions.append(archive_index_extension)
+            if self.write_manifest:
+                sidecar_extensions += self.writeArchiveManifest(temporary_file, written_entries, archive_file)
+            if self.write_size_report:
+                self.writeSizeReport(temporary_file, written_entries, archive_file)
+                sidecar_extensions.append(archive_size_report_extension)
+            with AdvisoryLock(archive_file):
+                for sidecar_extension in sidecar_extensions:
+                    os.replace(temporary_file + sidecar_extension,
+                               archive_file + sidecar_extension)
+                os.replace(temporary_file, archive_file)
+        finally:
+            for leftover in [temporary_file] + [temporary_file + extension for extension in archive_sidecar_extensions]:
+                if os.path.isfile(leftover):
+                    os.remove(leftover)
+        for sidecar_extension in sidecar_extensions:
+            print("i Archive sidecar written: {}".format(archive_file + sidecar_extension))
+
+    def writeArchiveEntries(self, archive_file, entries, previous_file = None):
+        # Entries are returned as tuples of (zipinfo, sha256 of the uncompressed data)
+        import hashlib
+        import zipfile
+        written_entries = []
+        started = time.time()
+        if (previous_file or self.entry_cache) and not raw_entries_supported:
+            print("w Compressed entries can't be copied with this Python version, compressing all entries")
+        # Opened once for validating the index and copying entries.
+        # Another run may replace the previous package in the meantime, but this handle keeps reading the same file.
+        previous_handle = None
+        if previous_file and raw_entries_supported:
+            try:
+                previous_handle = open(previous_file, "rb")
+            except OSError:
+                pass
+        reused = 0
+        try:
+            reusable_entries = self.loadReusableEntries(previous_handle, previous_file + archive_index_extension) if previous_handle else {}
+            with open(archive_file, "wb") as archive_handle:
+                if self.write_manifest:
+                    # Hashing the archive while writing it, instead of reading it again afterwards
+                    archive_handle = HashingWriter(archive_handle)
+                with zipfile.ZipFile(archive_handle, "w",
+                                     compression = self.compression) as zip_object:
+                    for arcname, filename_build, data in self.orderArchiveEntries(entries):
+                        print("d Packaging: {}".format(arcname))
+                        zipinfo = self.getZipInfo(arcname, filename_build)
+                        if filename_build:
+                            with open(filename_build, "rb") as fopen:
+                                data = fopen.read()
+                        elif type(data) is str:
+                            data = data.encode("utf-8")
+                        sha256 = hashlib.sha256(data).hexdigest()
+                        compresslevel = self.getCompressionLevel(zipinfo.compress_type)
+                        reusable_entry = reusable_entries.get((sha256, zipinfo.compress_type, compresslevel))
+                        if reusable_entry and not arcname.endswith("/"):
+                            previous_zipinfo, data_offset = reusable_entry
+                            previous_handle.seek(data_offset)
+                            raw_entry = (previous_zipinfo.CRC,
+                                         previous_zipinfo.flag_bits,
+                                         previous_handle.read(previous_zipinfo.compress_size))
+                            if writeZipEntry(zip_object, zipinfo, data, compresslevel, raw_entry = raw_entry):
+                                reused += 1
+                        elif self.entry_cache and raw_entries_supported and zipinfo.compress_type != zipfile.ZIP_STORED and len(data) >= entry_cache_minimum_size:
+                            self.writeCachedEntry(zip_object, zipinfo, data, sha256, compresslevel)
+                        else:
+                            zip_object.writestr(zipinfo, data,
+                                                compresslevel = compresslevel)
+                        written_entries.append((zipinfo, sha256))
+                if self.write_manifest:
+                    self.archive_sha256 = archive_handle.hexdigest()
+                    self.archive_size = archive_handle.tell()
+        finally:
+            if previous_handle:
+                previous_handle.close()
+        if previous_file:
+            print("i Reused {} of {} compressed entries from the previous package".format(reused, len(written_entries)))
+        self.reportCompression(written_entries, time.time() - started)
+        return written_entries
+
+    def loadReusableEntries(self, previous_handle, index_file):
+        # Compressed entries of the previous package by (sha256, compression, level), as listed in its index
+        import json
+        import zipfile
+        try:
+            with open(index_file) as index_handle:
+                index = json.load(index_handle)
+        except (OSError, ValueError):
+            return {}
+        try:
+            # Closing the ZipFile leaves the handle open
+            with zipfile.ZipFile(previous_handle, "r") as zip_ref:
+                previous_zipinfos = dict([(zipinfo.filename, zipinfo) for zipinfo in zip_ref.infolist()])
+        except zipfile.BadZipFile:
+            return {}
+
+        reusable_entries = {}
+        for entry in index.get("entries", []):
+            zipinfo = previous_zipinfos.get(entry["name"])
+            # Making sure the index still describes the package
+            if not zipinfo or not entry.get("sha256"):
+                continue
+            if (zipinfo.CRC, zipinfo.compress_size, zipinfo.header_offset) != (entry["crc32"], entry["compressed_size"], entry["header_offset"]):
+                continue
+            reusable_entries[(entry["sha256"], entry["compress_type"], entry.get("compress_level"))] = (zipinfo, entry["data_offset"])
+        return reusable_entries
+
+    def writeCachedEntry(self, zip_object, zipinfo, data, sha256, compresslevel):
+        cached_entry = self.entry_cache.get(sha256, zipinfo.compress_type, compresslevel)
+        if cached_entry:
+            crc, flag_bits, file_size, raw_data = cached_entry
+            writeZipEntry(zip_object, zipinfo, data, compresslevel, raw_entry = (crc, flag_bits, raw_data))
+            return
+        raw_entry = writeZipEntry(zip_object, zipinfo, data, compresslevel, keep_raw_entry = True)
+        if raw_entry:
+            crc, flag_bits, raw_data = raw_entry
+            self.entry_cache.put(sha256, zipinfo.compress_type, compresslevel, crc, flag_bits, len(data), raw_data)
+
+    def getCompressionLevel(self, method):
+        import zipfile
+        if self.compression_level in compression_presets.keys():
+            return compression_presets[self.compression_level].get(method)
+        if method == zipfile.ZIP_BZIP2 and self.compression_level == 0: # bzip2 starts at level 1
+            return 1
+        return self.compression_level
+
+    def tuneCompression(self, entries):
+        # Sampling files spread over the whole archive
+        files = sorted([(arcname, filename_build) for arcname, filename_build, data in entries if filename_build])
+        total_size = sum([os.path.getsize(filename_build) for arcname, filename_build in files])
+        if total_size <= compression_sample_size:
+            picked_files, share = files, -1
+        else:
+            # Large files contribute their beginning only, so they can't crowd out the others
+            picked_files = files[::max(1, len(files) // compression_sample_files)]
+            share = max(1, compression_sample_size // len(picked_files))
+        sample = []
+        for arcname, filename_build in picked_files:
+            with open(filename_build, "rb") as fopen:
+                sample.append(fopen.read(share))
+        sample_size = sum([len(data) for data in sample]) or 1
+
+        # Picking the smallest result, which fits into the time budget
+        results = []
+        for method, level in compression_candidates:
+            started = time.time()
+            compressed_size = sum([len(compressSample(data, method, level)) for data in sample])
+            elapsed = max(time.time() - started, 1e-6)
+            estimated_time = elapsed * total_size / sample_size
+            results.append((compressed_size, estimated_time, method, level, elapsed))
+            print("d Compression trial: {} (level {}) - ratio {:.4f}, estimated {:.2f}s".format(getCompressionName(method), level, compressed_size / sample_size, estimated_time))
+        within_budget = [result for result in results if result[1] <= self.compression_budget]
+        if within_budget:
+            compressed_size, estimated_time, method, level, elapsed = min(within_budget)
+        else:
+            compressed_size, estimated_time, method, level, elapsed = min(results, key = lambda result: result[1])
+
+        self.compression = method
+        self.compression_level = level
+        print("i Compression selected: {} (level {}) - sample ratio {:.4f}, {:.1f} MB/s".format(getCompressionName(method), level,
+                                                                                             compressed_size / sample_size,
+                                                                                             sample_size / elapsed / 1e6))
+
+    def reportCompression(self, written_entries, elapsed):
+        size = sum([zipinfo.file_size for zipinfo, sha256 in written_entries])
+        compressed_size = sum([zipinfo.compress_size for zipinfo, sha256 in written_entries])
+        self.compression_report = {"method": getCompressionName(self.compression),
+                                   "level": self.getCompressionLevel(self.compression),
+                                   "auto": self.compression_auto,
+                                   "ratio": round(compressed_size / size, 4) if size else 1.0,
+                                   "throughput": round(size / max(elapsed, 1e-6), 1),
+                                   }
+        print("i Compression: {} (level {}) - ratio {:.4f}, {:.1f} MB/s".format(self.compression_report["method"],
+                                                                              self.compression_report["level"],
+                                                                              self.compression_report["ratio"],
+                                                                              self.compression_report["throughput"] / 1e6))
+
+    def writeArchiveManifest(self, archive_file, written_entries, published_file = None):
+        import json
+        if not published_file:
+            published_file = archive_file
+        manifest = {"archive": os.path.basename(published_file),
+                    "size": self.archive_size,
+                    "sha256": self.archive_sha256,
+                    "compression": self.compression_report,
+                    "entries": [],
+                    }
+        for zipinfo, sha256 in written_entries:
+            manifest["entries"].append({"name": zipinfo.filename,
+                                        "size": zipinfo.file_size,
+                                        "compressed_size": zipinfo.compress_size,
+                                        "compression_ratio": round(zipinfo.compress_size / zipinfo.file_size, 4) if zipinfo.file_size else 1.0,
+                                        "sha256": sha256,
+                                        })
+
+        manifest_file = archive_file + archive_manifest_extension
+        manifest_data = json.dumps(manifest,
+                                   indent = 4,
+                                   ).encode("utf-8")
+        with open(manifest_file, "wb") as manifest_handle:
+            manifest_handle.write(manifest_data)
+        if not self.sign_key:
+            return [archive_manifest_extension]
+
+        # The signature covers the exact bytes of the manifest file
+        signature = signManifest(manifest_data, self.sign_key, self.sign_method)
+        with open(manifest_file + archive_signature_extension, "w") as signature_handle:
+            signature_handle.write(signature + "\n")
+        return [archive_manifest_extension,
+                archive_manifest_extension + archive_signature_extension]
+
+    def writeSizeReport(self, archive_file, written_entries, published_file = None):
+        import json
+        if not published_file:
+            published_file = archive_file
+
+        def addSizes(group, key, zipinfo):
+            sizes = group.setdefault(key, {})
+            sizes.setdefault("files", 0)
+            sizes.setdefault("size", 0)
+            sizes.setdefault("compressed_size", 0)
+            sizes["files"] += 1
+            sizes["size"] += zipinfo.file_size
+            sizes["compressed_size"] += zipinfo.compress_size
+
+        report = {"archive": os.path.basename(published_file),
+                  "compression": self.compression_report,
+                  "total": {},
+                  "directories": {},
+                  "extensions": {},
+                  "files": {},
+                  "largest": [],
+                  "growth": [],
+                  }
+        report["total"] = {"files": 0,
+                           "size": 0,
+                           "compressed_size": 0,
+                           }
+        for zipinfo, sha256 in written_entries:
+            if zipinfo.filename.endswith("/"):
+                continue
+            addSizes(report, "total", zipinfo)
+            addSizes(report["files"], zipinfo.filename, zipinfo)
+            extension = os.path.splitext(zipinfo.filename.split("/")[-1])[1].lower() or "(none)"
+            addSizes(report["extensions"], extension, zipinfo)
+            # Directories include everything below them
+            parts = zipinfo.filename.split("/")[:-1]
+            for depth in range(1, len(parts) + 1):
+                addSizes(report["directories"], "/".join(parts[:depth]) + "/", zipinfo)
+
+        groups = [report["total"]] + [sizes for group in ("directories", "extensions", "files") for sizes in report[group].values()]
+        for sizes in groups:
+            sizes["ratio"] = round(sizes["compressed_size"] / sizes["size"], 4) if sizes["size"] else 1.0
+
+        largest = sorted(report["files"].items(), key = lambda item: item[1]["compressed_size"], reverse = True)
+        for filename, sizes in largest[:self.size_report_top]:
+            report["largest"].append(dict(sizes, name = filename))
+
+        # Comparing against the previous report of this archive, if there is any
+        baseline_file = self.size_report_baseline or published_file + archive_size_report_extension
+        baseline = None
+        if os.path.isfile(baseline_file):
+            try:
+                with open(baseline_file) as baseline_handle:
+                    baseline = json.load(baseline_handle)
+                if type(baseline) is not dict:
+                    raise ValueError("Not a size report")
+            except (OSError, ValueError) as error:
+                print("w Size report baseline can't be read, skipping the comparison: {} ({})".format(baseline_file, error))
+                baseline = None
+        if baseline:
+            comparisons = [("total", {"": baseline.get("total", {})}, {"": report["total"]})]
+            comparisons += [(group, baseline.get(group, {}), report[group]) for group in ("directories", "extensions", "files")]
+            for group, previous_sizes, current_sizes in comparisons:
+                for name, sizes in current_sizes.items():
+                    previous = previous_sizes.get(name, {}).get("compressed_size")
+                    if not previous:
+                        continue
+                    growth = (sizes["compressed_size"] - previous) * 100.0 / previous
+                    if growth > self.size_report_threshold:
+                        report["growth"].append({"group": group,
+                                                 "name": name,
+                                                 "previous": previous,
+                                                 "current": sizes["compressed_size"],
+                                                 "growth": round(growth, 2),
+                                                 })
+                        print("w Size grew by {:.1f}%: {} {} ({} -> {} bytes)".format(growth, group, repr(name), previous, sizes["compressed_size"]))
+
+        print("i Size: {} files, {} bytes, {} bytes compressed".format(report["total"]["files"],
+                                                                        report["total"]["size"],
+                                                                        report["total"]["compressed_size"]))
+        for entry in report["largest"]:
+            print("i Size: {} bytes compressed - {}".format(entry["compressed_size"], entry["name"]))
+
+        with open(archive_file + archive_size_report_extension, "w") as report_handle:
+            report_handle.write(json.dumps(report,
+                                           indent = 4,
+                                           )
+            )
+
+    def writeArchiveIndex(self, archive_file, written_entries, published_file = None):
+        import json
+        import zipfile
+        if not published_file:
+            published_file = archive_file
+        digests = dict([(zipinfo.filename, sha256) for zipinfo, sha256 in written_entries])
+        index = {"archive": os.path.basename(published_file),
+                 "layout": self.layout,
+                 "metadata_span": 0,
+                 "entries": [],
+                 }
+
+        with open(archive_file, "rb") as archive_handle, zipfile.ZipFile(archive_handle, "r") as zip_ref:
+            metadata_leading = True
+            for zipinfo in zip_ref.infolist():
+                data_offset = getDataOffset(archive_handle, zipinfo)
+                index["entries"].append({"name": zipinfo.filename,
+                                         "header_offset": zipinfo.header_offset,
+                                         "data_offset": data_offset,
+                                         "compress_type": zipinfo.compress_type,
+                                         "compress_level": self.getCompressionLevel(zipinfo.compress_type),
+                                         "compressed_size": zipinfo.compress_size,
+                                         "size": zipinfo.file_size,
+                                         "crc32": zipinfo.CRC,
+                                         "sha256": digests.get(zipinfo.filename),
+                                         })
+                if metadata_leading and self.isArchiveMetadata(zipinfo.filename):
+                    index["metadata_span"] = data_offset + zipinfo.compress_size
+                else:
+                    metadata_leading = False
+
+        index_file = archive_file + archive_index_extension
+        with open(index_file, "w") as index_handle:
+            index_handle.write(json.dumps(index,
+                                          indent = 4,
+                                          )
+            )
+
+class PackageCreator(CreatorCommon):
+    "Creates package files based on package info (package.json)"
+
+    target_sdk = 0
+    default_result_extension = "curapackage"
+
+    CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+  <Default ContentType="application/vnd.openxmlformats-package.relationships+xml" Extension="rels" />
+  <Default ContentType="application/x-ultimaker-material-profile" Extension="xml.fdm_material" />
+  <Default ContentType="application/x-ultimaker-material-sig" Extension="xml.fdm_material.sig" />
+  <Default ContentType="application/x-ultimaker-quality-profile" Extension="inst.cfg" />
+  <Default ContentType="application/x-ultimaker-machine-definition" Extension="def.json" />
+  <Default ContentType="text/json" Extension="json" />
+</Types>
+"""
+
+    RELATION_BASE = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rel0" Target="/package.json" Type="http://schemas.ultimaker.org/package/2018/relationships/opc_metadata" />
+</Relationships>
+"""
+
+    RELATION_PLUGIN_BASE = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rel0" Target="/files/plugins" Type="plugin" />
+</Relationships>
+"""
+
+    def __init__(self, args):
+        super().__init__(args)
+        self.package_location = self.source_dir
+        self.plugin_location = None
+
+        # Load package metadata
+        self.loadPackageMeta()
+
+    def verify(self):
+        super().verify()
+
+        # Source validation check
+        if not self.checkValidSource():
+            print("e The provided source is not valid!")
+            return False
+
+        if not self.verifyPluginMetadata():
+            print("e The provided source is not valid!")
+            return False
+
+        if not super().verify():
+            return False
+
+        return True
+
+    def checkValidSource(self, directory = None):
+        if not directory:
+            directory = self.source_dir
+
+        # A plugin must be a folder
+        if not self.source_files.isdir(directory):
+            return False
+        print("d Verify: Found project base")
+
+        # Checking whether all keywords are present
+        for keywords in package_600_fields:
+            test_object = self.package_meta
+            for keyword in keywords:
+                if keyword not in test_object.keys():
+                    print("! ERROR: Missing keyword in metadata: {}".format(repr(".".join(keywords))))
+                    return False
+                else:
+                    test_object = test_object[keyword]
+            print("d Verify: Found keyword in metadata: {}".format(repr(".".join(keywords))))
+
+        # Trying to find source base
+        expected_plugin_locations = (os.path.join(self.source_dir, self.package_meta["package_type"], self.package_meta["package_id"]), # As placed in the final package
+                                 os.path.join(self.source_dir, self.package_meta["package_id"]), # as done at CuraDrive
+                                 os.path.join(self.source_dir, ), # in case the package.json is in the same directory as the sources
+                                 )
+        result = False
+        for expected_plugin_location in expected_plugin_locations:
+            print("d Testing path: {}".format(repr(expected_plugin_location)))
+            # Checking for some general requirements here:
+            # A source base must contain an __init__.py
+            if not self.source_files.isfile(os.path.join(expected_plugin_location, "__init__.py")):
+                continue
+            print("d Verify: Found __init__ file")
+
+            print("i Found source base")
+            self.plugin_location = expected_plugin_location
+            result = True
+            break
+
+        if not result:
+            print("e Plugin sources not found!")
+            return False
+
+        if not self.findLicenseFile(directory):
+            print("e License not found!")
+            return False
+
+        # Plugin data
+        self.loadPluginMeta(self.plugin_location)
+        self.checkValidPluginMetadata()
+
+        # All checks done
+        print("i Verification passed!")
+        return True
+
+    def checkValidPluginMetadata(self):
+        # Checking whether target SDK version is within the list of supported SDKs
+        if type(self.target_sdk) in (tuple, list):
+            if not ".".join([str(enum) for enum in self.target_sdk]) in self.plugin_meta["supported_sdk_versions"]:
+                return False
+        elif type(self.target_sdk) is int:
+            if "minimum_api" in self.plugin_meta.keys():
+                minimum_api = self.plugin_meta["minimum_api"]
+            else:
+                minimum_api = self.plugin_meta["api"]
+            plugin_api_range = range(minimum_api, self.plugin_meta["api"] + 1)
+            if not self.target_sdk in plugin_api_range:
+                return False
+        else:
+            print("e Wrong datatype for target_sdk!")
+            return False
+
+        return True
+
+    def verifyPluginMetadata(self):
+        if not self.plugin_meta or not self.package_meta:
+            raise ValueError("One of the metadata or both is None and/or empty!")
+
+        # Equality of IDs
+        if not self.plugin_meta["id"] == self.package_meta["package_id"]:
+            print("e Plugin ID is not the same as package ID!")
+            return False
+        # Equality of the names
+        if not self.plugin_meta["name"] == self.package_meta["display_name"]:
+            print("e Plugin name is not the same as display name!")
+            return False
+        # Equality of the names
+        if not self.plugin_meta["version"] == self.package_meta["package_version"]:
+            print("e Plugin version is not the same as package version")
+            return False
+        if not self.package_meta["sdk_version"] == int(self.package_meta["sdk_version_semver"].split(".")[0]):
+            print("e SDK version is not the same as SDK version semver[0]!")
+            return False
+        if not self.package_meta["package_type"] == "plugin":
+            print("Unexpected package format: {}".format(repr(self.package_meta["package_type"])))
+            return False
+        return True
+
+    def prepare(self):
+        # Preparing build..
+        self.prepareBuildDirectory(self.build_dir)
+
+    def build(self):
+        # Build all files.. Compile and copy them..
+        _build_base = self.build_dir
+        if type(self.target_sdk) is int:
+            if self.target_sdk <= 4:
+                # A bug(?) which was included in early packages in Cura.
+                _build_base = os.path.join(_build_base, "_")
+        _build_base = os.path.join(_build_base, "files", "plugins", self.package_meta["package_id"])
+        self.plugin_build_dir = _build_base
+        self.compileAllPySources(self.plugin_location, _build_base, self.variant, optimize = args.optimize)
+        self.copyOtherFiles(self.plugin_location, _build_base)
+        self.installLicenseFile(_build_base)
+        self.bundleVendoredPackages(_build_base, optimize = args.optimize)
+        self.buildPackageMetadata(sort_keywords = True)
+        self.buildPluginMetadata(location = _build_base)
+
+    def bundle(self):
+        # Building the package
+        self.buildPackageFile(self.build_dir)
+
+    def test(self):
+        pass
+
+    def clean(self):
+        # Clean up build directory
+        self.cleanUpBuildDirectory(self.build_dir)
+
+    def generatePluginMetadata(self, override = False):
+        if self.source_files.isfile(os.path.join(self.plugin_location, plugin_metadata_filename)) and not override:
+            print("w Metadata of the plugin already exists. Skipping automated creation!")
+            return
+
+    @property
+    def result_name(self):
+        if self._result_name:
+            return self._result_name
+
+        if self.result_extension:
+            result_extension = self.result_extension
+        else:
+            result_extension = self.default_result_extension
+
+        if type(self.target_sdk) in (tuple, list):
+            sdk_tag = "sdk-" + "".join([str(x) for x in self.target_sdk])
+        elif type(self.target_sdk) is int:
+            sdk_tag = "sdk-{}".format(self.target_sdk)
+        else:
+            raise ValueError("Wrong data type of target_sdk!")
+
+        plugin_file = "{}-{}.{}.{}".format(self.plugin_meta["id"],
+                                           self.plugin_meta["version"],
+                                           sdk_tag,
+                                           result_extension)
+        plugin_file = os.path.join(self.result_dir, plugin_file)
+        return plugin_file
+
+    def buildPackageFile(self, build_dir):
+        archive_file = self.result_name
+
+        entries = [("[Content_Types].xml", None, self.CONTENT_TYPES),
+                   ("_rels/.rels", None, self.RELATION_BASE),
+                   ("_rels/package.json.rels", None, self.RELATION_PLUGIN_BASE),
+                   ]
+        entries += self.collectBuildEntries(build_dir)
+
+        self.writeArchive(archive_file, entries)
+        print("i Package built: {}".format(archive_file))
+
+
+class PluginCreator(CreatorCommon):
+    "Creates plugin files based on plugin info (plugin.json)"
+    # It is either or: ["umplugin", "curaplugin"] - using None here to provocate errors with os.path
+    default_result_extension = None
+
+    def __init__(self, args):
+        super().__init__(args)
+        self.plugin_location = self.source_dir
+        self.package_location = None
+        self.source_imports = None # Reading all sources once is enough
+        self.license_file = None
+
+        # (optionally) Load package metadata
+        self.package_meta = None
+        if self.isPackageMeta():
+            self.loadPackageMeta()
+            self.package_location = self.plugin_location
+
+    def verify(self):
+        super().verify()
+
+        # We might got pointed to an package source directory...
+        if not self.checkValidSource():
+            if self.package_meta:
+                guessed_plugin_directory_in_package_source = os.path.join(self.source_dir, self.package_meta["package_id"])
+                if self.checkValidSource(guessed_plugin_directory_in_package_source):
+                    self.plugin_location = guessed_plugin_directory_in_package_source
+            else:
+                print("e Could not suggest an alternative plugin source location without any package metadata!")
+                return False
+
+        # Double-check..
+        if not self.checkValidSource(self.plugin_location):
+            print("e The provided source is not valid!")
+            return False
+
+        if not super().verify():
+            return False
+
+        return True
+
+    def prepare(self):
+        # Preparing build..
+        self.prepareBuildDirectory(self.build_dir)
+
+    def build(self):
+        # Build all files.. Compile and copy them..
+        self.plugin_build_dir = self.build_dir
+        self.compileAllPySources(self.plugin_location, self.build_dir, self.variant, optimize = args.optimize)
+        self.copyOtherFiles(self.plugin_location, self.build_dir)
+        self.installLicenseFile(self.build_dir)
+        self.bundleVendoredPackages(self.build_dir, optimize = args.optimize)
+        self.buildPluginMetadata(api = self.target_api)
+
+    def bundle(self):
+        # Building the package
+        self.buildPluginFile(self.build_dir)
+
+    def test(self):
+        # Testing package
+        return self.testPackage()
+
+    def clean(self):
+        # Clean up build directory
+        self.cleanUpBuildDirectory(self.build_dir)
+
+    def checkValidSource(self, directory = None):
+        if not directory:
+            directory = self.source_dir
+
+        # A plugin must be a folder
+        if not self.source_files.isdir(directory):
+            print("e Verify: Source location is not a directory!")
+            return False
+        print("d Verify: Found source at <{}>".format(directory))
+
+        # A plugin must contain an __init__.py
+        if not self.source_files.isfile(os.path.join(directory, "__init__.py")):
+            print("e Verify: Found no __init__ file")
+            return False
+        print("d Verify: Found __init__ file")
+
+        # .. and a plugin must contain an plugin.json!
+        if not self.isPluginMeta(directory):
+            print("e Verify: Found no plugin metadata")
+            return False
+        print("d Verify: Found plugin metadata")
+        self.loadPluginMeta(directory)
+        print("d Verify: Loaded plugin metadata")
+
+        if not self.findLicenseFile(directory):
+            print("e License not found!")
+            return False
+
+        # Checking whether all keywords are given in the metadata
+        for keyword in essential_plugin_fields:
+            if keyword not in self.plugin_meta.keys():
+                print("e Missing keyword in plugin definition: {}".format(repr(keyword)))
+                return False
+            else:
+                print("d Verify: Found keyword in {} definition.".format(repr(keyword)))
+
+        # Checking API/SDK version
+        if "minimum_api" in self.plugin_meta.keys():
+            minimum_api = self.plugin_meta["minimum_api"]
+        else:
+            minimum_api = self.plugin_meta["api"]
+        plugin_api_range = range(minimum_api, self.plugin_meta["api"] + 1)
+        if not self.target_api in plugin_api_range:
+            print("! ERROR: API/SDK {} is not within {}".format(self.target_api, repr(list(plugin_api_range))))
+            return False
+
+        print("i Verification passed!")
+
+        return True
+
+    def checkSourceImports(self, path):
+        imports_cura = False
+        imports_uranium = False
+        for root, dirs, filenames in self.source_files.walk(path):
+            for filename in filenames:
+                print("d Checking imports in file: {}".format(filename))
+                filename = os.path.join(root, filename)
+                extension = os.path.splitext(filename)[1]
+                if extension in python_sources:
+                    source_file = io.TextIOWrapper(self.source_files.open(filename), errors='ignore')
+                    for line in source_file.readlines():
+                        if "import" in line and "cura." in line:
+                            imports_cura = True
+                        elif "import" in line and "UM." in line:
+                            imports_uranium = True
+
+        if imports_cura:
+            return "cura"
+        elif imports_uranium:
+            return "uranium"
+        else:
+            raise ValueError("This is impossible! You need to import Uranium at least!")
+
+    @property
+    def result_name(self):
+        if self._result_name:
+            return self._result_name
+
+        if self.result_extension:
+            result_extension = self.result_extension
+        else:
+            if not self.source_imports:
+                self.source_imports = self.checkSourceImports(self.plugin_location)
+            result_extension = ["umplugin", "curaplugin"][self.source_imports == "cura"]
+
+        plugin_file = "{}-{}.{}.{}".format(self.plugin_meta["id"],
+                                           self.plugin_meta["version"],
+                                           "api-{}".format(self.target_api),
+                                           result_extension)
+        plugin_file = os.path.join(self.result_dir, plugin_file)
+        return plugin_file
+
+    def buildPluginFile(self, build_dir):
+        plugin_file = self.result_name
+
+        # Cura convention: Plugin inside the zip needs to be in a directory with the same name of the plugin itself.
+        # Originally taken from Uranium:
+        ## Ensure that the root folder is created correctly.
+        entries = [(self.plugin_meta["id"] + "/", None, ""), #Writing an empty string creates the directory.
+                   ]
+        entries += self.collectBuildEntries(build_dir, prefix = self.plugin_meta["id"])
+
+        self.writeArchive(plugin_file, entries)
+        print("i Package built: {}".format(plugin_file))
+
+    def testPackage(self):
+        import zipfile
+        plugin_file = self.result_name
+
+        # Checking for the Cura conventions!
+        with zipfile.ZipFile(plugin_file, "r") as zip_ref:
+            plugin_id = None
+            for file in zip_ref.infolist():
+                if file.filename.endswith("/"):
+                    plugin_id = file.filename.strip("/")
+                    break
+
+            if not plugin_id == self.plugin_meta["id"]:
+                print("e Plugin name shall be {} and not {}!".format(repr(self.plugin_meta["id"]), repr(plugin_id)))
+                return False
+
+        # Checking whether license is present
+        with zipfile.ZipFile(plugin_file, "r") as zip_ref:
+            license_file_found = False
+            for license_filename in license_filenames:
+                license_path = os.path.join(plugin_id, license_filename)
+                if license_path in [entry.filename for entry in zip_ref.infolist()]:
+                    license_file_found = True
+
+            if not license_file_found:
+                print("e License file not found!")
+                return False
+
+        # Checking whether metadata is present
+        with zipfile.ZipFile(plugin_file, "r") as zip_ref:
+            metadata_path = os.path.join(plugin_id, plugin_metadata_filename)
+            if not metadata_path in [entry.filename for entry in zip_ref.infolist()]:
+                print("e Metadata file not found!")
+                return False
+
+        print("i Built plugin file is valid!")
+        return True
+
+class Package610Creator(PackageCreator):
+    "Creates package files based on package info (package.json)"
+
+    supported_formats = ["package610"]
+    target_sdk = (6, 1, 0)
+
+class Package600Creator(PackageCreator):
+    "Creates package files based on package info (package.json)"
+
+    supported_formats = ["package600"]
+    target_sdk = (6, 0, 0)
+
+class Package5Creator(PackageCreator):
+    "Creates package files based on package info (package.json)"
+
+    supported_formats = ["package5"]
+    target_api = 5
+    target_sdk = 5
+
+class Package4Creator(PackageCreator):
+    "Creates package files based on package info (package.json)"
+
+    supported_formats = ["package4"]
+    target_api = 4
+    target_sdk = 4
+
+class Plugin4Creator(PluginCreator):
+    supported_formats = ["plugin4"]
+    target_api = 4
+
+class PluginSource4Creator(Plugin4Creator):
+    default_result_extension = "zip"
+
+    def __init__(self, args):
+        import zipfile
+        super().__init__(args)
+        # The following values are known to work well with Ultimaker's contributors portal
+        self.result_extension = "zip"
+        self.compression = zipfile.ZIP_DEFLATED
+        self.compression_auto = False
+        self.variant = "source"
+
+class Plugin5Creator(PluginCreator):
+    supported_formats = ["plugin5"]
+    target_api = 5
+
+class PluginSource5Creator(Plugin5Creator):
+    default_result_extension = "zip"
+
+    def __init__(self, args):
+        import zipfile
+        super().__init__(args)
+        # The following values are known to work well with Ultimaker's contributors portal
+        self.result_extension = "zip"
+        self.compression = zipfile.ZIP_DEFLATED
+        self.compression_auto = False
+        self.variant = "source"
+
+class PluginSourceCreator(PluginSource5Creator):
+    "Creates a source archive, which can be uploaded to Ultimaker's contributors portal. This one is a plugin without any package info."
+    target_sdk = None
+    supported_formats = ["source"]
+
+    def __init__(self, args):
+        super().__init__(args)
+
+    def checkValidSource(self, directory = None):
+        if not super().checkValidSource(directory):
+            return False
+
+        if self.target_sdk:
+            # Checking whether the targetted SDK version is supported.
+            if not PackageCreator.checkValidPluginMetadata(self):
+                return False
+
+        return True
+
+class PluginSource600Creator(PluginSourceCreator):
+    "Creates a source archive, which can be uploaded to Ultimaker's contributors portal. This one is a plugin without any package info."
+    target_sdk = (6, 0, 0)
+
+creators = (Package610Creator, Package600Creator, Package5Creator, Package4Creator, Plugin4Creator, PluginSourceCreator)
+default_format = creators[0].supported_formats[0]
+supported_formats = []
+for creator in creators:
+    supported_formats += creator.supported_formats
+    del creator
+
+def main():
+    # The options are read all over this module
+    import argparse
+    global args
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--create", "--cr", "-C",
+                        dest="create",
+                        type = str,
+                        default = default_format,
+                        choices = supported_formats + ["all"],
+                        help = "Choose which creator to take to build your file")
+    parser.add_argument("--source", "--src", "-s",
+                        dest="source",
+                        type = str,
+                        default = "./source",
+                        help = "Location of the source folder, a git repository or a source archive (.zip, .tar.gz, .tar.xz, ..)")
+    parser.add_argument("--exclude", "--excl", "-e",
+                        dest="exclude",
+                        type = str,
+                        default = None,
+                        help = "Exclude files or directories separated via os.pathsep")
+    parser.add_argument("--downloaddir", "--dldir", "-dd",
+                        dest="downloaddir",
+                        type = str,
+                        default = "download",
+                        help = "Location of the download folder. Every run uses its own unique directory inside.")
+    parser.add_argument("--build", "--bld", "-b",
+                        dest="build",
+                        type = str,
+                        default = "build",
+                        help = "Location of the build folder. Every run uses its own unique directory inside.")
+    parser.add_argument("--destination", "--dest", "-d",
+                        dest="destination",
+                        type = str,
+                        default = os.curdir,
+                        help = "Location, where to place the resulting package")
+    parser.add_argument("--result", "--res", "-r",
+                        dest="result",
+                        type = str,
+                        default = None,
+                        help = "Name of the resulting file. Automatically generated if not set.")
+    parser.add_argument("--variant", "--var", "-v",
+                        dest="variant",
+                        type = str,
+                        default = "source",
+                        choices = ["binary+source",
+                                   "binary",
+                                   "source",
+                                   ],
+                        help = "Variant of build")
+    parser.add_argument("--compression", "--comp", "-c",
+                        dest="compression",
+                        type = str,
+                        default = "zlib",
+                        choices = ["none",
+                                   "zlib",
+                                   "bzip2",
+                                   "lzma",
+                                   "auto",
+                                   ],
+                        help = "Package compression. auto tries all methods and levels on a sample of the files.")
+    parser.add_argument("--level", "--lvl",
+                        dest="level",
+                        type = compressionLevel,
+                        default = None,
+                        help = "Compression level (0-9) or preset: {}".format(", ".join(compression_presets.keys())))
+    parser.add_argument("--compression-budget",
+                        dest="compression_budget",
+                        type = float,
+                        default = 30.0,
+                        help = "Time budget in seconds for compressing the package, when using --compression=auto")
+    parser.add_argument("--layout", "--lay", "-l",
+                        dest="layout",
+                        type = str,
+                        default = "default",
+                        choices = archive_layouts,
+                        help = "Order of the entries inside the archive. With --manifest all entries are streamed with data descriptors, so their local headers carry no CRC and sizes.")
+    parser.add_argument("--index", "--idx",
+                        dest="index",
+                        action = "store_true",
+                        help = "Write a sidecar index (JSON) with offsets, sizes and hashes of all entries")
+    parser.add_argument("--incremental", "--inc",
+                        dest="incremental",
+                        action = "store_true",
+                        help = "Copy unchanged compressed entries from the previous package instead of compressing them again. Implies --index.")
+    parser.add_argument("--entry-cache", "--ec",
+                        dest="entry_cache",
+                        type = str,
+                        default = None,
+                        help = "Directory to cache compressed entries in. Identical files are compressed only once, shared between plugins and runs.")
+    parser.add_argument("--entry-cache-size",
+                        dest="entry_cache_size",
+                        type = int,
+                        default = 512,
+                        help = "Maximum size of the entry cache in MiB")
+    parser.add_argument("--manifest", "--mf",
+                        dest="manifest",
+                        action = "store_true",
+                        help = "Write a manifest (JSON) with SHA-256 digests of the archive and all entries, computed while writing")
+    parser.add_argument("--sign-key", "--key",
+                        dest="sign_key",
+                        type = str,
+                        default = None,
+                        help = "Key file to sign the manifest with. Implies --manifest. HMAC keys are the bytes of the file as they are, including any line break at its end.")
+    parser.add_argument("--sign-method", "--sign",
+                        dest="sign_method",
+                        type = str,
+                        default = "hmac-sha256",
+                        choices = signature_methods,
+                        help = "Signature method of the manifest")
+    parser.add_argument("--size-report", "--size",
+                        dest="size_report",
+                        action = "store_true",
+                        help = "Write a size report (JSON) per directory, extension and file")
+    parser.add_argument("--size-report-top",
+                        dest="size_report_top",
+                        type = int,
+                        default = 10,
+                        help = "Number of largest entries listed in the size report")
+    parser.add_argument("--size-report-baseline",
+                        dest="size_report_baseline",
+                        type = str,
+                        default = None,
+                        help = "Previous size report to compare with. Defaults to the existing report next to the result.")
+    parser.add_argument("--size-report-threshold",
+                        dest="size_report_threshold",
+                        type = float,
+                        default = 10.0,
+                        help = "Growth in percent, which is flagged in the size report")
+    parser.add_argument("--import-report", "--imports",
+                        dest="import_report",
+                        action = "store_true",
+                        help = "Analyze which modules of the plugin's sources run when Cura loads it and write a report (JSON)")
+    parser.add_argument("--import-timing",
+                        dest="import_timing",
+                        action = "store_true",
+                        help = "Also measure the import time of the built plugin in a subprocess with stubs for Uranium and Cura. Needs a Python interpreter on the PATH, when cpo is frozen. Implies --import-report.")
+    parser.add_argument("--vendored",
+                        dest="vendored",
+                        type = str,
+                        default = None,
+                        help = "Directories inside the plugin containing vendored packages, separated via os.pathsep")
+    parser.add_argument("--zipimport", "--zi",
+                        dest="zipimport",
+                        type = str,
+                        default = "none",
+                        choices = zipimport_modes,
+                        help = "Bundle the vendored directories into one inner archive each, imported via zipimport. pyc stores bytecode for the running Python version only.")
+    parser.add_argument("--publish", "--pub",
+                        dest="publish",
+                        type = str,
+                        default = None,
+                        help = "URL of the artifact store to upload the results and their sidecars to")
+    parser.add_argument("--publish-jobs",
+                        dest="publish_jobs",
+                        type = int,
+                        default = 4,
+                        help = "Number of concurrent uploads")
+    parser.add_argument("--publish-chunk-size",
+                        dest="publish_chunk_size",
+                        type = int,
+                        default = 8,
+                        help = "Size of the uploaded chunks in MiB")
+    parser.add_argument("--publish-retries",
+                        dest="publish_retries",
+                        type = int,
+                        default = 3,
+                        help = "Number of times an interrupted upload gets resumed")
+    parser.add_argument("--publish-header",
+                        dest="publish_header",
+                        action = "append",
+                        type = httpHeader,
+                        default = [],
+                        help = "Additional HTTP header for the artifact store, like \"Authorization: Bearer <token>\". Can be given multiple times.")
+    parser.add_argument("--delta-from",
+                        dest="delta_from",
+                        type = str,
+                        default = None,
+                        help = "Previous package, or a directory containing previous versions, to create a delta update from")
+    parser.add_argument("--apply-delta",
+                        dest="apply_delta",
+                        type = str,
+                        default = None,
+                        help = "Reconstruct a package from this delta and --delta-base instead of building")
+    parser.add_argument("--delta-base",
+                        dest="delta_base",
+                        type = str,
+                        default = None,
+                        help = "Previous package, which the delta given via --apply-delta is applied to")
+    parser.add_argument("--force", "-f",
+                        dest="force",
+                        action = "store_true",
+                        help = "Rebuild, even if the inputs did not change since the last build")
+    parser.add_argument("--optimize", "--opt", "-o",
+                        dest="optimize",
+                        type = int,
+                        default = 0,
+                        choices = range(3),
+                        help = "Location of the build folder")
+    parser.add_argument("--gitargs", "-ga",
+                        dest="gitargs",
+                        type = str,
+                        default = "",
+                        help = "git arguments")
+    parser.add_argument("--gitmode", "-gm",
+                        dest="gitmode",
+                        type = str,
+                        default = "full",
+                        choices = ["full",
+                                   "sparse",
+                                   ],
+                        help = "Clone the whole tree or only the paths, which are used to build the plugin (blobless and sparse)")
+    parser.add_argument("--gitjobs", "-gj",
+                        dest="gitjobs",
+                        type = int,
+                        default = min(8, os.cpu_count() or 1),
+                        help = "Number of submodules fetched in parallel")
+    args = parser.parse_args()
+
+    if args.apply_delta:
+        if not args.delta_base:
+            print("Error: --apply-delta needs the previous package given via --delta-base!")
+            exit(1)
+        if not applyDelta(args.apply_delta, args.delta_base, args.result or args.destination):
+            exit(1)
+        exit()
+
+    if args.create == "all":
+        targets = supported_formats
+    else:
+        if args.create in supported_formats:
+            targets = [args.create]
+        else:
+            print("Unsupported creator selected!")
+            exit(1)
+
+    # Terminated runs (like on CI timeouts) shall clean up as well
+    import signal
+    signal.signal(signal.SIGTERM, exitOnSignal)
+
+    # Isolating this run from other ones using the same locations
+    args.build_base = args.build
+    args.build = createWorkDirectory(args.build_base)
+
+    args.source = getSource(args.source)
+    if not args.source:
+        print("Error: Source not found!")
+        exit(1)
+    args.source_files = openSourceFiles(args.source)
+    if args.entry_cache:
+        args.entry_cache = EntryCache(args.entry_cache, args.entry_cache_size * 1024 * 1024)
+
+    publisher = None
+    if args.publish:
+        publisher = Publisher(args.publish,
+                              jobs = args.publish_jobs,
+                              chunk_size = args.publish_chunk_size * 1024 * 1024,
+                              retries = args.publish_retries,
+                              headers = dict(args.publish_header),
+                              )
+
+    for target in targets:
+        for creator in creators:
+            if target not in creator.supported_formats:
+                continue
+            creator = creator(args)
+            if creator.verify():
+                if creator.isUpToDate():
+                    print("i Inputs unchanged, reusing: {}".format(creator.result_name))
+                    if args.delta_from:
+                        # The previous package may have changed since, or the delta was never created
+                        creator.createDelta()
+                    if publisher:
+                        creator.publish(publisher)
+                    continue
+                creator.prepare()
+                creator.build()
+                creator.analyze()
+                creator.bundle()
+                tested = creator.test()
+                creator.clean()
+                if tested is not False and args.delta_from:
+                    creator.createDelta()
+                if tested is not False:
+                    creator.writeFingerprint()
+                    if publisher:
+                        creator.publish(publisher)
+
+    if args.entry_cache:
+        args.entry_cache.trim()
+    if publisher and not publisher.run():
+        exit(1)
+    exit()
@@ -2,7 +2,26 @@ from cx_Freeze import setup, Executable
 
 # Dependency fine tuning.
 build_exe_options = {"optimize" : 2,
-                     "include_msvcr": True,}
+                     "include_msvcr": True,
+                     # Pulled in by the standard library, but never used by cpo
+                     "excludes": ["asyncio",
+                                  "distutils",
+                                  "lib2to3",
+                                  "multiprocessing",
+                                  "pydoc",
+                                  "pydoc_data",
+                                  "setuptools",
+                                  "sqlite3",
+                                  "test",
+                                  "tkinter",
+                                  "unittest",
+                                  "xml",
+                                  "xmlrpc",
+                                  ],
+                     # Loading all modules from one zip file saves lots of file system lookups on startup
+                     "zip_include_packages": ["*"],
+                     "zip_exclude_packages": [],
+                     }
 
 # console application
 base = None
@@ -0,0 +1,48 @@
+#!/bin/bash
+# Measure the startup of cpo: import time and time until the first output.
+# Covers the script and the frozen executable, if it was built via "python3 setup.py build".
+
+CPO_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+ROUNDS=${ROUNDS:-20}
+COLD_CACHE=$(mktemp -d)
+trap 'rm -rf "$COLD_CACHE"' EXIT
+FROZEN=$(ls "$CPO_DIR"/build/exe.*/cpo "$CPO_DIR"/build/exe.*/cpo.exe 2>/dev/null | head -n 1)
+
+measure() {
+    python3 - "$ROUNDS" "$@" <<'END'
+import subprocess, sys, time
+
+rounds = int(sys.argv[1])
+first_output = []
+total = []
+for _ in range(rounds):
+    started = time.perf_counter()
+    process = subprocess.Popen(sys.argv[2:], stdout = subprocess.PIPE, stderr = subprocess.DEVNULL)
+    process.stdout.read(1)
+    first_output.append(time.perf_counter() - started)
+    process.communicate()
+    total.append(time.perf_counter() - started)
+print("  time to first output: {:.1f} ms, total: {:.1f} ms (median of {} runs)".format(sorted(first_output)[rounds // 2] * 1000,
+                                                                                    sorted(total)[rounds // 2] * 1000,
+                                                                                    rounds))
+END
+}
+
+# Without cached bytecode the module is compiled first, like on the first run after an update
+echo "Import time of curapluginoven.py, without cached bytecode:"
+(cd "$CPO_DIR" && PYTHONPYCACHEPREFIX="$COLD_CACHE" python3 -B -X importtime -c "import curapluginoven" 2>&1 >/dev/null | grep -E "\| curapluginoven$" | awk -F'|' '{printf "  %.1f ms cumulative\n", $2 / 1000}')
+python3 -m compileall -q "$CPO_DIR/curapluginoven.py"
+echo "Import time of curapluginoven.py, with cached bytecode:"
+(cd "$CPO_DIR" && python3 -X importtime -c "import curapluginoven" 2>&1 >/dev/null | grep -E "\| curapluginoven$" | awk -F'|' '{printf "  %.1f ms cumulative\n", $2 / 1000}')
+echo "Slowest imports:"
+(cd "$CPO_DIR" && python3 -X importtime -c "import curapluginoven" 2>&1 >/dev/null | grep -v -E "\| curapluginoven$" | sort -t'|' -k2 -n -r | head -n 5)
+
+echo "Script (--help):"
+measure python3 "$CPO_DIR/cpo.py" --help
+
+if [ -n "$FROZEN" ]; then
+    echo "Frozen executable (--help): $FROZEN"
+    measure "$FROZEN" --help
+else
+    echo "Frozen executable not found, skipping. Build it via: python3 setup.py build"
+fi
@@ -0,0 +1,43 @@
+#!/bin/bash
+# Test whether building from a compressed tar file is about as fast as from a directory.
+# Reading members out of order used to decompress the tar stream from the start again and again.
+
+CPO_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+WORK=$(mktemp -d)
+trap 'rm -rf "$WORK"' EXIT
+
+python3 "$CPO_DIR/tests/demo-plugin.py" "$WORK/DemoPlugin-1.0" 1500 8192
+tar -czf "$WORK/DemoPlugin-1.0.tar.gz" -C "$WORK" DemoPlugin-1.0
+mkdir "$WORK/out-directory" "$WORK/out-archive"
+
+now() {
+    python3 -c "import time; print(time.time())"
+}
+
+build() {
+    local started=$(now)
+    python3 "$CPO_DIR/cpo.py" --create=package610 --source="$1" --destination="$2" --force > "$2.log" 2>&1 || { cat "$2.log"; exit 1; }
+    python3 -c "print(round($(now) - $started, 2))"
+}
+
+DIRECTORY_TIME=$(build "$WORK/DemoPlugin-1.0" "$WORK/out-directory")
+ARCHIVE_TIME=$(build "$WORK/DemoPlugin-1.0.tar.gz" "$WORK/out-archive")
+echo "Directory: ${DIRECTORY_TIME}s, tar.gz: ${ARCHIVE_TIME}s"
+
+python3 - "$WORK" <<'END'
+import sys, zipfile
+work = sys.argv[1]
+directory = zipfile.ZipFile(work + "/out-directory/DemoPlugin-1.0.0.sdk-610.curapackage")
+archive = zipfile.ZipFile(work + "/out-archive/DemoPlugin-1.0.0.sdk-610.curapackage")
+assert archive.testzip() is None
+assert sorted(directory.namelist()) == sorted(archive.namelist()), "Different files packaged"
+for name in directory.namelist():
+    assert directory.read(name) == archive.read(name), "Different content: " + name
+END
+[ $? -eq 0 ] || exit 1
+
+if python3 -c "exit($ARCHIVE_TIME <= 3 * $DIRECTORY_TIME + 2)"; then
+    echo "FAILED: Building from the tar.gz file is much slower than from the directory"
+    exit 1
+fi
+echo "OK"
@@ -0,0 +1,73 @@
+#!/bin/bash
+# Test whether sparse clones only check out the plugin and fetch only the submodules inside of it.
+# Uses local file:// repositories, so no network is needed.
+
+CPO_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+WORK=$(mktemp -d)
+trap 'rm -rf "$WORK"' EXIT
+
+# Submodules from file:// URLs are blocked by default since git 2.38.1
+export GIT_CONFIG_COUNT=1 GIT_CONFIG_KEY_0=protocol.file.allow GIT_CONFIG_VALUE_0=always
+GIT="git -c user.name=cpo -c user.email=cpo@example.com -c init.defaultBranch=master"
+
+createRepository() {
+    $GIT init -q "$1"
+    echo "$2" > "$1/README"
+    $GIT -C "$1" add -A
+    $GIT -C "$1" commit -q -m "Initial commit"
+}
+
+# Monorepo: metadata in the root, the plugin in plugin/DemoPlugin and unrelated directories next to it
+createRepository "$WORK/vendored" "Vendored library inside of the plugin"
+createRepository "$WORK/tools" "Tools outside of the plugin"
+python3 "$CPO_DIR/tests/demo-plugin.py" "$WORK/plugin-files"
+createRepository "$WORK/repository.git" "Monorepo"
+mkdir -p "$WORK/repository.git/plugin" "$WORK/repository.git/docs"
+mv "$WORK/plugin-files/package.json" "$WORK/plugin-files/LICENSE" "$WORK/repository.git/"
+mv "$WORK/plugin-files" "$WORK/repository.git/plugin/DemoPlugin"
+echo "Not needed to build the plugin" > "$WORK/repository.git/docs/manual.txt"
+$GIT -C "$WORK/repository.git" submodule add -q "file://$WORK/vendored" plugin/DemoPlugin/lib/vendored
+$GIT -C "$WORK/repository.git" submodule add -q "file://$WORK/tools" tools/external
+$GIT -C "$WORK/repository.git" add -A
+$GIT -C "$WORK/repository.git" commit -q -m "Add plugin"
+# Serving blobless clones like hosting services do
+$GIT -C "$WORK/repository.git" config uploadpack.allowFilter true
+
+cd "$CPO_DIR"
+python3 - "$WORK" <<'END'
+import argparse, os, sys
+
+import curapluginoven
+
+work = sys.argv[1]
+curapluginoven.args = argparse.Namespace(gitargs = "", gitjobs = 2)
+destination = os.path.join(work, "clone")
+assert curapluginoven.cloneSparse("file://" + work + "/repository.git", destination), "Sparse clone failed"
+
+def exists(path):
+    return os.path.exists(os.path.join(destination, path))
+
+checks = {"package.json": True,
+          "LICENSE": True,
+          "plugin/DemoPlugin/plugin.json": True,
+          "plugin/DemoPlugin/sub/helper.py": True,
+          "plugin/DemoPlugin/lib/vendored/README": True, # Submodule inside of the sparse checkout
+          "docs/manual.txt": False,
+          "tools/external/README": False, # Submodule outside of the sparse checkout
+          }
+failed = [path for path, expected in checks.items() if exists(path) != expected]
+for path in failed:
+    print("FAILED: {} should {}be checked out".format(path, "" if checks[path] else "not "))
+sys.exit(1 if failed else 0)
+END
+[ $? -eq 0 ] || exit 1
+
+# Building straight from the repository
+mkdir "$WORK/out"
+python3 "$CPO_DIR/cpo.py" --create=package610 --source="file://$WORK/repository.git" --gitmode=sparse --destination="$WORK/out" > "$WORK/build.log" 2>&1
+if [ ! -f "$WORK/out/DemoPlugin-1.0.0.sdk-610.curapackage" ]; then
+    cat "$WORK/build.log"
+    echo "FAILED: Package was not built from the sparse clone"
+    exit 1
+fi
+echo "OK"
@@ -0,0 +1,57 @@
+#!/bin/bash
+# Test whether a package reconstructed by --apply-delta is byte by byte identical to the built one.
+# Build, change the plugin, build again with --delta-from, apply the delta to the previous package and compare.
+
+CPO_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+WORK=$(mktemp -d)
+trap 'rm -rf "$WORK"' EXIT
+
+fail() {
+    echo "FAILED: $1"
+    exit 1
+}
+
+python3 "$CPO_DIR/tests/demo-plugin.py" "$WORK/source" 40 8192
+mkdir "$WORK/releases" "$WORK/out" "$WORK/restored"
+
+python3 "$CPO_DIR/cpo.py" --create=package610 --source="$WORK/source" --destination="$WORK/releases" > "$WORK/build.log" 2>&1 || fail "First build"
+BASE="$WORK/releases/DemoPlugin-1.0.0.sdk-610.curapackage"
+[ -f "$BASE" ] || fail "First package not built"
+# Newer package of another plugin, whose id starts like ours. Must not be taken as the base.
+cp "$BASE" "$WORK/releases/DemoPlugin-Extra-2.0.0.sdk-610.curapackage"
+
+# New version with one changed and one added file
+python3 - "$WORK/source" <<'END'
+import json, os, sys
+source = sys.argv[1]
+for filename, key in (("package.json", "package_version"), ("plugin.json", "version")):
+    with open(os.path.join(source, filename)) as meta_handle:
+        meta = json.load(meta_handle)
+    meta[key] = "1.1.0"
+    with open(os.path.join(source, filename), "w") as meta_handle:
+        json.dump(meta, meta_handle)
+with open(os.path.join(source, "data", "00", "file00000.txt"), "a") as changed_handle:
+    changed_handle.write(" changed")
+with open(os.path.join(source, "added.txt"), "w") as added_handle:
+    added_handle.write("Added in 1.1.0\n")
+END
+
+python3 "$CPO_DIR/cpo.py" --create=package610 --source="$WORK/source" --destination="$WORK/out" --delta-from="$WORK/releases" > "$WORK/build.log" 2>&1 || fail "Second build"
+TARGET="$WORK/out/DemoPlugin-1.1.0.sdk-610.curapackage"
+grep -q "i Delta written" "$WORK/build.log" || { cat "$WORK/build.log"; fail "Delta not written"; }
+python3 - "$TARGET.delta" <<'END' || fail "Wrong base picked"
+import json, sys, zipfile
+with zipfile.ZipFile(sys.argv[1]) as delta_zip:
+    delta = json.loads(delta_zip.read("delta.json").decode("utf-8"))
+assert delta["base"]["name"] == "DemoPlugin-1.0.0.sdk-610.curapackage", delta["base"]["name"]
+END
+
+python3 "$CPO_DIR/cpo.py" --apply-delta="$TARGET.delta" --delta-base="$BASE" --destination="$WORK/restored" > "$WORK/apply.log" 2>&1 || { cat "$WORK/apply.log"; fail "Applying the delta"; }
+cmp "$TARGET" "$WORK/restored/DemoPlugin-1.1.0.sdk-610.curapackage" || fail "Reconstructed package differs"
+
+# A missing base is reported before building anything
+python3 "$CPO_DIR/cpo.py" --create=package610 --source="$WORK/source" --destination="$WORK/out" --force --delta-from="$WORK/nonexistent" > "$WORK/build.log" 2>&1
+grep -q "^e Package or directory to create the delta from not found" "$WORK/build.log" || { cat "$WORK/build.log"; fail "Missing base not reported"; }
+grep -q "Traceback" "$WORK/build.log" && fail "Missing base raised an exception"
+
+echo "OK"
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# Writes a minimal plugin, which the tests can build.
+# Usage: demo-plugin.py <directory> [<number of extra files> [<size of each extra file>]]
+
+import json
+import os
+import random
+import sys
+
+package_meta = {"package_id": "DemoPlugin",
+                "package_type": "plugin",
+                "display_name": "Demo",
+                "description": "Plugin used by the tests of cpo",
+                "package_version": "1.0.0",
+                "sdk_version": 6,
+                "sdk_version_semver": "6.1.0",
+                "website": "https://example.com",
+                "author": {"author_id": "demo",
+                           "display_name": "Demo",
+                           "email": "demo@example.com",
+                           "website": "https://example.com",
+                           },
+                "tags": [],
+                }
+
+plugin_meta = {"name": "Demo",
+               "id": "DemoPlugin",
+               "author": "Demo",
+               "version": "1.0.0",
+               "description": "Plugin used by the tests of cpo",
+               "api": 6,
+               "minimum_api": 4,
+               "supported_sdk_versions": ["6.0.0", "6.1.0"],
+               }
+
+files = {"__init__.py": "from . import DemoPlugin\n\ndef getMetaData():\n    return {}\n\ndef register(app):\n    return {\"extension\": DemoPlugin.DemoPlugin()}\n",
+         "DemoPlugin.py": "class DemoPlugin():\n    pass\n",
+         "sub/__init__.py": "",
+         "sub/helper.py": "def help():\n    return 42\n",
+         "LICENSE": "Demo license\n",
+         }
+
+def writeDemoPlugin(location, extra_files = 0, extra_size = 4096):
+    os.makedirs(location, exist_ok = True)
+    with open(os.path.join(location, "package.json"), "w") as package_handle:
+        json.dump(package_meta, package_handle)
+    with open(os.path.join(location, "plugin.json"), "w") as plugin_handle:
+        json.dump(plugin_meta, plugin_handle)
+    for filename, content in files.items():
+        os.makedirs(os.path.dirname(os.path.join(location, filename)), exist_ok = True)
+        with open(os.path.join(location, filename), "w") as file_handle:
+            file_handle.write(content)
+
+    # Compressible data, spread over several directories
+    words = ["{:06x}".format(random.getrandbits(24)) for _ in range(256)]
+    for number in range(extra_files):
+        filename = os.path.join(location, "data", "{:02d}".format(number % 20), "file{:05d}.txt".format(number))
+        os.makedirs(os.path.dirname(filename), exist_ok = True)
+        with open(filename, "w") as file_handle:
+            file_handle.write(" ".join([random.choice(words) for _ in range(extra_size // 7)]))
+
+if __name__ == "__main__":
+    writeDemoPlugin(sys.argv[1], *[int(argument) for argument in sys.argv[2:]])
@@ -0,0 +1,78 @@
+#!/bin/bash
+# Test whether archives with copied compressed entries (--incremental, --entry-cache) are valid and complete.
+# Run with PYTHON=python3.x to test another Python version.
+
+CPO_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+PYTHON=${PYTHON:-python3}
+WORK=$(mktemp -d)
+trap 'rm -rf "$WORK"' EXIT
+
+python3 "$CPO_DIR/tests/demo-plugin.py" "$WORK/source" 40 8192
+
+"$PYTHON" - "$CPO_DIR/cpo.py" "$WORK" <<'END'
+import os, subprocess, sys, zipfile
+
+cpo, work = sys.argv[1:]
+package = "DemoPlugin-1.0.0.sdk-610.curapackage"
+
+def build(destination, *options):
+    os.makedirs(destination, exist_ok = True)
+    result = subprocess.run([sys.executable, cpo, "--create=package610", "--source=" + os.path.join(work, "source"),
+                             "--destination=" + destination, "--force"] + list(options),
+                            stdout = subprocess.PIPE, stderr = subprocess.STDOUT, universal_newlines = True)
+    assert result.returncode == 0 and "i Package built" in result.stdout, result.stdout
+    return [line for line in result.stdout.splitlines() if line.startswith(("i Reused", "i Entry cache", "w Compressed"))]
+
+def check(destination, expected):
+    with zipfile.ZipFile(os.path.join(destination, package)) as archive, zipfile.ZipFile(os.path.join(expected, package)) as expected_archive:
+        assert archive.testzip() is None, "Broken entry in " + destination
+        assert archive.namelist() == expected_archive.namelist(), "Different entries in " + destination
+        for name in archive.namelist():
+            assert archive.read(name) == expected_archive.read(name), "Different content of {} in {}".format(name, destination)
+
+changed_file = os.path.join(work, "source", "data", "00", "file00000.txt")
+for compression in ("zlib", "bzip2", "lzma"):
+    for manifest in ([], ["--manifest"]):
+        name = compression + "-".join([""] + [option.strip("-") for option in manifest])
+        options = ["--compression=" + compression] + manifest
+        cache = ["--entry-cache=" + os.path.join(work, "cache-" + name)]
+        incremental = os.path.join(work, "incremental-" + name)
+        cached = os.path.join(work, "cached-" + name)
+        expected = os.path.join(work, "expected-" + name)
+
+        build(incremental, "--incremental", *options)
+        build(cached, *(cache + options))
+        with open(changed_file, "a") as changed_handle:
+            changed_handle.write(" changed")
+
+        output = build(incremental, "--incremental", *options)
+        output += build(cached, *(cache + options))
+        build(expected, *options)
+        check(incremental, expected)
+        check(cached, expected)
+        if any([line.startswith("w Compressed") for line in output]):
+            print("{}: entries were compressed again, as this Python version isn't supported".format(name))
+        else:
+            reused = [line for line in output if line.startswith("i Reused")][0]
+            assert not reused.startswith("i Reused 0 "), reused
+            hits = [line for line in output if line.startswith("i Entry cache")][0]
+            assert not hits.startswith("i Entry cache: 0 "), hits
+            print("{}: {}, {}".format(name, reused, hits))
+
+# A damaged cache entry of the same length must not end up in the package
+cache = os.path.join(work, "cache-zlib")
+entry = sorted([os.path.join(root, filename) for root, dirs, filenames in os.walk(cache) for filename in filenames])[0]
+with open(entry, "r+b") as entry_handle:
+    entry_handle.seek(-10, os.SEEK_END)
+    byte = entry_handle.read(1)
+    entry_handle.seek(-10, os.SEEK_END)
+    entry_handle.write(bytes([byte[0] ^ 0xff]))
+damaged = os.path.join(work, "damaged")
+expected = os.path.join(work, "expected-damaged")
+build(damaged, "--compression=zlib", "--entry-cache=" + cache)
+build(expected, "--compression=zlib")
+check(damaged, expected)
+print("damaged entry: not copied")
+END
+[ $? -eq 0 ] || { echo "FAILED"; exit 1; }
+echo "OK"
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# Stand-in for an artifact store with resumable uploads, used by tests/publish.sh.
+#
+# HEAD with X-Checksum-Sha256 answers 200, when the file is stored with this checksum,
+# or 308 with a Range header for the bytes received so far.
+# PUT stores a whole file or, with Content-Range "bytes <first>-<last>/<size>", a chunk of it.
+# "bytes */<size>" completes an upload, whose bytes are all on the server already.
+# GET /_status lists the stored files and all requests as JSON.
+
+import argparse
+import hashlib
+import http.server
+import json
+import re
+import threading
+
+class StoreHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *arguments):
+        pass
+
+    def reply(self, status, headers = None, body = b""):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def drop(self):
+        self.close_connection = True
+        self.connection.close()
+
+    def do_GET(self):
+        if self.path != "/_status":
+            return self.reply(404)
+        with self.server.lock:
+            status = {"files": dict([(path, {"size": len(data),
+                                             "sha256": hashlib.sha256(data).hexdigest(),
+                                             })
+                                     for path, data in self.server.files.items()]),
+                      "requests": self.server.requests,
+                      }
+        self.reply(200, {"Content-Type": "application/json"}, json.dumps(status).encode("utf-8"))
+
+    def do_HEAD(self):
+        digest = self.headers.get("X-Checksum-Sha256")
+        with self.server.lock:
+            self.server.requests.append(["HEAD", self.path, None])
+            stored = self.server.files.get(self.path)
+            partial = self.server.partial.get(self.path)
+        if stored is not None and hashlib.sha256(stored).hexdigest() == digest:
+            return self.reply(200, {"X-Checksum-Sha256": digest})
+        if partial and partial[0] == digest and partial[1]:
+            return self.reply(308, {"Range": "bytes=0-{}".format(len(partial[1]) - 1)})
+        self.reply(404)
+
+    def do_PUT(self):
+        length = int(self.headers.get("Content-Length", 0))
+        digest = self.headers.get("X-Checksum-Sha256")
+        content_range = self.headers.get("Content-Range")
+        with self.server.lock:
+            self.server.requests.append(["PUT", self.path, content_range])
+            chunk_number = len([request for request in self.server.requests if request[0] == "PUT" and request[1] == self.path and request[2]])
+        failing = self.path.endswith(self.server.failing_suffix)
+
+        if not content_range:
+            data = self.rfile.read(length)
+            with self.server.lock:
+                self.server.files[self.path] = data
+            return self.reply(201)
+
+        completion = re.fullmatch(r"bytes \*/(\d+)", content_range)
+        chunk = re.fullmatch(r"bytes (\d+)-(\d+)/(\d+)", content_range)
+        if completion:
+            first, size = None, int(completion.group(1))
+        elif chunk and int(chunk.group(1)) <= int(chunk.group(2)) and int(chunk.group(2)) - int(chunk.group(1)) + 1 == length:
+            first, size = int(chunk.group(1)), int(chunk.group(3))
+        else:
+            self.rfile.read(length)
+            return self.reply(400)
+
+        with self.server.lock:
+            partial = self.server.partial.get(self.path)
+            if not partial or partial[0] != digest:
+                partial = self.server.partial[self.path] = [digest, b""]
+        if first is None:
+            if length or len(partial[1]) != size:
+                self.rfile.read(length)
+                return self.reply(400)
+        else:
+            if first > len(partial[1]):
+                self.rfile.read(length)
+                return self.reply(400) # Gap in the data
+            if failing and chunk_number == self.server.drop_chunk:
+                # Connection lost after receiving half of the chunk
+                partial[1] = partial[1][:first] + self.rfile.read(length // 2)
+                return self.drop()
+            partial[1] = partial[1][:first] + self.rfile.read(length)
+            if failing and len(partial[1]) == size and self.server.lose_completion:
+                # Connection lost after receiving everything, but before completing the upload
+                self.server.lose_completion = False
+                return self.drop()
+
+        if len(partial[1]) < size:
+            return self.reply(308, {"Range": "bytes=0-{}".format(len(partial[1]) - 1)})
+        with self.server.lock:
+            self.server.files[self.path] = partial[1]
+            del self.server.partial[self.path]
+        self.reply(201)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port-file",
+                        dest="port_file",
+                        required = True,
+                        help = "File to write the port to, once the server is listening")
+    parser.add_argument("--failing-suffix",
+                        dest="failing_suffix",
+                        default = "",
+                        help = "Simulate failures only for uploads, whose path ends like this")
+    parser.add_argument("--drop-chunk",
+                        dest="drop_chunk",
+                        type = int,
+                        default = None,
+                        help = "Drop the connection in the middle of this chunk of the upload")
+    parser.add_argument("--lose-completion",
+                        dest="lose_completion",
+                        action = "store_true",
+                        help = "Drop the connection once after an upload received all of its bytes, without completing it")
+    args = parser.parse_args()
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StoreHandler)
+    server.lock = threading.Lock()
+    server.files = {}
+    server.partial = {}
+    server.requests = []
+    server.failing_suffix = args.failing_suffix
+    server.drop_chunk = args.drop_chunk
+    server.lose_completion = args.lose_completion
+    with open(args.port_file, "w") as port_handle:
+        port_handle.write(str(server.server_address[1]))
+    server.serve_forever()
@@ -0,0 +1,75 @@
+#!/bin/bash
+# Test publishing against a local stand-in for the artifact store:
+# chunked uploads, resuming after dropped connections and skipping files, which are on the server already.
+
+CPO_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+WORK=$(mktemp -d)
+SERVER_PID=""
+trap 'kill $SERVER_PID 2>/dev/null; rm -rf "$WORK"' EXIT
+
+# Packaged uncompressed, so it spans several chunks of 1 MiB
+python3 "$CPO_DIR/tests/demo-plugin.py" "$WORK/source" 300 8192
+PACKAGE="DemoPlugin-1.0.0.sdk-610.curapackage"
+
+startServer() {
+    kill $SERVER_PID 2>/dev/null
+    rm -f "$WORK/port"
+    python3 "$CPO_DIR/tests/publish-server.py" --port-file="$WORK/port" "$@" &
+    SERVER_PID=$!
+    while [ ! -s "$WORK/port" ]; do sleep 0.1; done
+    URL="http://127.0.0.1:$(cat "$WORK/port")"
+}
+
+publish() {
+    python3 "$CPO_DIR/cpo.py" --create=package610 --source="$WORK/source" --destination="$WORK/out" \
+        --compression=none --manifest --publish="$URL/store" --publish-chunk-size=1 --publish-retries=2 "$@" > "$WORK/publish.log" 2>&1
+    local result=$?
+    grep -E "^(i|w|e) (Published|Publishing|Upload)" "$WORK/publish.log"
+    return $result
+}
+
+fail() {
+    echo "FAILED: $1"
+    exit 1
+}
+
+# Checks that the server stored the package byte by byte and that its requests match
+checkServer() {
+    python3 - "$URL/_status" "$WORK/out/$PACKAGE" "$@" <<'END'
+import hashlib, json, os, sys, urllib.request
+status = json.load(urllib.request.urlopen(sys.argv[1]))
+package = sys.argv[2]
+stored = status["files"].get("/store/" + os.path.basename(package))
+assert stored, "Package not stored"
+assert stored["sha256"] == hashlib.sha256(open(package, "rb").read()).hexdigest(), "Stored package differs"
+assert "/store/" + os.path.basename(package) + ".manifest.json" in status["files"], "Manifest not stored"
+chunks = [request for request in status["requests"] if request[0] == "PUT" and request[1].endswith(".curapackage")]
+for check in sys.argv[3:]:
+    name, _, value = check.partition("=")
+    if name == "min-chunks":
+        assert len(chunks) >= int(value), "Expected at least {} chunks, got {}".format(value, len(chunks))
+    elif name == "completion":
+        assert [request for request in chunks if request[2].startswith("bytes */")], "Upload was not completed"
+END
+}
+
+mkdir "$WORK/out"
+
+echo "Chunked upload, connection dropped in the middle of the second chunk"
+startServer --failing-suffix=.curapackage --drop-chunk=2
+publish || fail "Publishing failed"
+grep -q "Published: .*$PACKAGE (uploaded, resumed at" "$WORK/publish.log" || fail "Upload was not resumed"
+checkServer min-chunks=3 || fail "Server state"
+
+echo "Publishing again, the package is reused and skipped"
+publish || fail "Publishing failed"
+grep -q "Inputs unchanged" "$WORK/publish.log" || fail "Package was built again"
+grep -q "Published: .*$PACKAGE (skipped, already on the server)" "$WORK/publish.log" || fail "Upload was not skipped"
+
+echo "Connection dropped after the last chunk, before the upload was completed"
+startServer --failing-suffix=.curapackage --lose-completion
+publish || fail "Publishing failed"
+grep -q "Published: .*$PACKAGE (uploaded, resumed at" "$WORK/publish.log" || fail "Upload was not resumed"
+checkServer completion || fail "Server state"
+
+echo "OK"